@@ -1,32 +1,52 @@
 import random
 
 
+# Every method that draws random numbers takes an rng: a backend.rng.RNG (or
+# anything with the random.Random methods). The default is the global random
+# module.
+
 class Chromosome:
-    def __init__(self, genes=None):
+    # One byte per gene; __slots__ keeps big populations small
+    __slots__ = ("genes", "version")
+
+    def __init__(self, genes=None, length=63, rng=random):
         # If no genes are provided, generate random ones
+        # (length = squares on the board - 1, one move per gene)
         if genes is None:
-            self.genes = self.randomGene()
-        else:
+            self.genes = self.randomGene(length, rng)
+        elif isinstance(genes, bytearray):
             self.genes = genes
+        else:
+            self.genes = bytearray(genes)
+        self.version = 0  # bumped whenever the genes change
 
     @staticmethod
-    def randomGene():
-        # Generate 63 random moves between 1 and 8
-        gene = []
-        for _ in range(63):
-            gene.append(random.randint(1,8))
-        return gene
-
-    def crossover(self, partner):
+    def randomGene(length=63, rng=random):
+        # Generate `length` random moves between 1 and 8
+        randint = rng.randint
+        return bytearray(randint(1,8) for _ in range(length))
+
+    def crossover(self, partner, rng=random):
         # Single-point crossover
-        point = random.randint(1, 62)  # crossover point between 1 and 62
+        point = rng.randint(1, len(self.genes) - 1)  # crossover point between 1 and length-1
         child1_genes = self.genes[:point] + partner.genes[point:]
         child2_genes = partner.genes[:point] + self.genes[point:]
         return Chromosome(child1_genes), Chromosome(child2_genes)
 
-    def mutation(self, mutation_rate=0.01):
+    def crossover_into(self, partner, child1, child2, rng=random):
+        # Same as crossover, but written over the genes of two existing
+        # chromosomes (same length) instead of allocating new ones
+        point = rng.randint(1, len(self.genes) - 1)
+        child1.genes[:] = self.genes
+        child1.genes[point:] = memoryview(partner.genes)[point:]
+        child2.genes[:] = partner.genes
+        child2.genes[point:] = memoryview(self.genes)[point:]
+        child1.version += 1
+        child2.version += 1
+
+    def mutation(self, mutation_rate=0.01, rng=random):
         for i in range(len(self.genes)):
-            if random.random() < mutation_rate:
-                self.genes[i] = random.randint(1,8)  # mutate to a new random move
+            if rng.random() < mutation_rate:
+                self.genes[i] = rng.randint(1,8)  # mutate to a new random move
+                self.version += 1
         return self
-
@@ -1,117 +1,97 @@
-
 import random
+from array import array
 from backend.Chromosome import Chromosome
+from backend.board import coordinates, neighbor_table, path_typecode, square as square_index
 
 
 
 class Knight:
-    def __init__(self,chromosome):
-        self.position =tuple((0,0))
+    # The visited mask only lives in check_moves, so it costs no memory per knight
+    __slots__ = ("width", "height", "start_square", "square", "chromosome", "path",
+                 "fitness", "decoded_version", "rng", "closed", "cache")
+
+    def __init__(self,chromosome, width=8, height=8, start=(0, 0), rng=random, closed=False,
+                 cache=None):
+        # rng draws the decoding coin flip (and random genes if chromosome is None).
+        # closed=True: a full tour ending a knight move from the start scores
+        # one more than the number of squares.
+        # cache: a PrefixCache shared by the knights of one board and start,
+        # decoding then resumes from the longest known prefix of the genes
+        self.rng = rng
+        self.closed = closed
+        self.cache = cache
+        self.width = width
+        self.height = height
+        self.start_square = square_index(*start, width)
+        self.square = self.start_square         # current square index
         if chromosome is None:
-            self.chromosome = Chromosome()
+            self.chromosome = Chromosome(length=width * height - 1, rng=rng)
         else:
             self.chromosome = chromosome
-        self.path =[self.position]
-        self.fitness = 0
-    
-    def move_forward(self,direction):
-        x,y=self.position
-        moves = {
-            1: (x+1, y+2),   # DOWN-right 
-            2: (x+2, y+1),   # RIGHT-down  
-            3: (x+2, y-1),   # RIGHT-up
-            4: (x+1, y-2),   # UP-right
-            5: (x-1, y-2),   # UP-left
-            6: (x-2, y-1),   # LEFT-up
-            7: (x-2, y+1),   # LEFT-down
-            8: (x-1, y+2)    # DOWN-left
-        }
-        new_pos = moves[direction]
-        self.position = new_pos
-        return new_pos
-    def move_backward(self,direction):
-        x,y=self.position
-        moves = {
-            1: (x-1, y-2),   # DOWN-right 
-            2: (x-2, y-1),   # RIGHT-down  
-            3: (x-2, y+1),   # RIGHT-up
-            4: (x-1, y+2),   # UP-right
-            5: (x+1, y+2),   # UP-left
-            6: (x+2, y+1),   # LEFT-up
-            7: (x+2, y-1),   # LEFT-down
-            8: (x+1, y-2)    # DOWN-left
-        }
-        self.position = moves[direction]
-        return self.position
-        
+        self.path = array(path_typecode(width, height), [self.square])   # visited squares, in order
+        self.fitness = None                     # set by check_moves
+        self.decoded_version = None             # chromosome version it was set for
 
+    def positions(self):
+        # The path as (row, col) tuples
+        return [coordinates(sq, self.width) for sq in self.path]
 
     def check_moves(self):
-        cycle_forward =random.choice([True, False])
-        
-        for i in range(len(self.chromosome.genes)):
-            gene = self.chromosome.genes[i]
-            
-            
-            # Try the original move
-            new_position = self.move_forward(gene)
-            
-            # Check if valid
-            if (0 <= new_position[0] < 8 and 
-                0 <= new_position[1] < 8 and 
-                new_position not in self.path):
-                # Valid move - ADD TO PATH
-                self.path.append(new_position)
-            else:
-                # Invalid move - cancel it using move_backward
-                self.move_backward(gene)
-                
-                # Try cycling through alternatives
-                found_valid = False
-                alternatives = []
-                
-                if cycle_forward:
-                    # Cycle forward: gene+1, gene+2, ..., wrapping around
-                    for j in range(1, 8):
-                        alt_gene = (gene + j - 1) % 8 + 1
-                        alternatives.append(alt_gene)
-                else:
-                    # Cycle backward: gene-1, gene-2, ..., wrapping around
-                    for j in range(1, 8):
-                        alt_gene = (gene - j - 1) % 8 + 1
-                        alternatives.append(alt_gene)
-                
-                # Try each alternative
-                for alt_gene in alternatives:
-                    alt_position = self.move_forward(alt_gene)
-                    
-                    if (0 <= alt_position[0] < 8 and 
-                        0 <= alt_position[1] < 8 and 
-                        alt_position not in self.path):
-                        # Valid alternative found
-                        self.chromosome.genes[i] = alt_gene  # Update chromosome
-                        self.path.append(alt_position)  # ADD TO PATH
-                        found_valid = True
-                        break
-                    else:
-                        # This alternative didn't work either, cancel it
-                        self.move_backward(alt_gene)
-                
+        cycle_forward =self.rng.random() < 0.5
+        step = 1 if cycle_forward else -1
 
+        genes = self.chromosome.genes
+        neighbors = neighbor_table(self.width, self.height)
+        path = self.path         # reused between decodes
+        cache = self.cache
+        if cache is None:
+            first = 0
+            square = self.start_square
+            visited = 1 << square    # visited mask, one bit per square
+            del path[1:]
+            path[0] = square
+            checkpoint = -1          # never reached
+        else:
+            first, square, visited = cache.resume(genes, path, self.start_square)
+            # index of the gene after which the next state is stored
+            checkpoint = first + cache.interval - 1
 
+        for i in range(first, len(genes)):
+            gene = genes[i]
+            moves = neighbors[square]
 
-    def evaluate_fitness(self):
-    
-        self.fitness = 1 
-        for i in range(1, len(self.path)):
-            current_pos = self.path[i]
-            if (0 <= current_pos[0] < 8 and 
-                0 <= current_pos[1] < 8 and 
-                current_pos not in self.path[:i]):  # Not visited before this point
-                self.fitness += 1
+            # Try the original move, then cycle through the alternatives:
+            # gene+1, gene+2, ... (forward) or gene-1, gene-2, ... (backward)
+            for j in range(8):
+                direction = (gene - 1 + step * j) % 8
+                target = moves[direction]
+                if target >= 0 and not (visited >> target) & 1:
+                    break
             else:
-                
+                # No valid move from here: the position can't change anymore,
+                # so every remaining gene would fail too
                 break
-        return self.fitness
 
+            if j:
+                genes[i] = direction + 1  # Update chromosome
+            square = target
+            visited |= 1 << target
+            path.append(target)
+            if i == checkpoint:
+                cache.store(genes, i + 1, square, visited, path)
+                checkpoint += cache.interval
 
+        self.square = square
+        # Every square on the decoded path is new, so the fitness is its length
+        self.fitness = len(path)
+        if self.closed and self.fitness == len(neighbors) and self.start_square in neighbors[square]:
+            self.fitness += 1
+        self.decoded_version = self.chromosome.version
+
+
+
+    def evaluate_fitness(self):
+        # Cached from check_moves, only decoded again if the chromosome changed
+        if self.fitness is None or self.decoded_version != self.chromosome.version:
+            self.check_moves()
+        return self.fitness
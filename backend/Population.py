@@ -1,22 +1,96 @@
+import heapq
+from array import array
 from backend.Knight import Knight
 from backend.Chromosome import Chromosome
-import random
+from backend.board import check_start
+from backend.heuristics import seed_genes
+from backend.memetic import improve_path, path_fitness, write_genes
+from backend.prefix_cache import PrefixCache
+from backend.rng import make_rng
+from backend.selection import elite, get_selection
 
 class Population:
-    def __init__(self, population_size, generation=1, knights=None):
+    def __init__(self, population_size, generation=1, knights=None,
+                 seed_fraction=0.0, seed_method="warnsdorff", width=8, height=8,
+                 start=(0, 0), crossover="single_point", selection="tournament",
+                 elitism=0, rng=None, closed=False, prefix_cache=0, memetic=0):
+        # seed_fraction of the knights start from Warnsdorff ("warnsdorff") or
+        # randomized greedy ("greedy") genes instead of random ones.
+        # selection names one of backend.selection.SELECTIONS; the elitism
+        # fittest knights go to the next generation unchanged.
+        # rng (a seed or backend.rng.RNG) draws every random number of the run.
+        # closed=True rewards closed tours (see Knight).
+        # prefix_cache > 0 keeps that many decoding states of gene prefixes
+        # (backend.prefix_cache), so children skip decoding the head they
+        # share with a parent. Results are the same with or without it. It is
+        # raised to at least one generation's worth of states.
+        # memetic > 0: after decoding, local search (backend.memetic) tries
+        # to extend the tours of that many fittest knights.
+        if crossover != "single_point":
+            # the other operators (backend.operators) work on gene matrices
+            raise ValueError(f"Crossover {crossover!r} needs engine='vectorized'")
+        check_start(start, width, height)
         self.population_size = population_size
         self.generation = generation
-        self.knights = [] 
-        for i in range (self.population_size):
-            kn=Knight(None)
-            self.knights.append(kn)
-            self.generation=1
+        self.width = width
+        self.height = height
+        self.start = start
+        self.selection = get_selection(selection)
+        self.elitism = elitism
+        self.rng = make_rng(rng)
+        self.closed = closed
+        self.memetic = memetic
+        self.spare = None   # previous generation's knights, reused for the next one
+        self.scratch = None  # dropped child of an odd number of children
+        self.cache = None
+        if prefix_cache:
+            self.cache = PrefixCache(width * height - 1, prefix_cache)
+            checkpoints = (width * height - 1) // self.cache.interval
+            self.cache.maxsize = max(prefix_cache, population_size * checkpoints)
+        if knights is not None:
+            self.knights = knights
+            for kn in knights:
+                kn.cache = self.cache
+        else:
+            self.knights = []
+            seeded = round(self.population_size * seed_fraction)
+            for i in range (self.population_size):
+                if i < seeded:
+                    genes = seed_genes(seed_method, width, height, start, self.rng)
+                    kn=Knight(Chromosome(genes), width, height, start, self.rng, closed,
+                              self.cache)
+                else:
+                    kn=Knight(None, width, height, start, self.rng, closed, self.cache)
+                self.knights.append(kn)
 
 
     def check_population(self):
+        self.decode()
+        if self.memetic:
+            self.local_search(self.memetic)
+
+    def decode(self):
         for kn in self.knights:
             kn.check_moves()
 
+    def local_search(self, k):
+        # Memetic stage: improve the tours of the k fittest knights and write
+        # the better ones back into their genes, which decode to them as is
+        target = self.width * self.height + self.closed
+        for kn in heapq.nlargest(k, self.knights, key=lambda kn: kn.fitness):
+            if kn.fitness == target:
+                continue
+            path = improve_path(kn.path, self.width, self.height, closed=self.closed,
+                                rng=self.rng)
+            fitness = path_fitness(path, self.width, self.height, self.closed)
+            if fitness > kn.fitness:
+                write_genes(kn.chromosome.genes, path, self.width, self.height)
+                kn.chromosome.version += 1
+                kn.path[:] = array(kn.path.typecode, path)
+                kn.square = path[-1]
+                kn.fitness = fitness
+                kn.decoded_version = kn.chromosome.version
+
     def evaluate(self):
         best_knight=None
         best_fitness=-1
@@ -27,26 +101,70 @@ class Population:
                 best_knight=kn
 
         return best_fitness,best_knight 
-           
 
-    def tournament_selection(self):
-        random_knights=random.choices(self.knights,k=3)
-        random_knights.sort(key=lambda k: k.evaluate_fitness(), reverse=True)
-        return random_knights[0], random_knights[1]
+    def mean_fitness(self):
+        return sum(kn.fitness for kn in self.knights) / len(self.knights)
 
+    def path(self, knight):
+        # Same call as VectorPopulation.path(index) for the best of evaluate()
+        return knight.positions()
 
+    def complete_paths(self):
+        # Squares of every knight's tour that visits the whole board (after
+        # check_population)
+        squares = self.width * self.height
+        return [kn.path.tolist() for kn in self.knights if kn.fitness >= squares]
+
+    def best_chromosomes(self, k):
+        # Genes of the k fittest knights (call after evaluate)
+        ranked = sorted(self.knights, key=lambda kn: kn.fitness, reverse=True)
+        return [bytearray(kn.chromosome.genes) for kn in ranked[:k]]
+           
 
     def create_new_generation(self):
-        new_knights=[]
-        for _ in range(self.population_size//2):
-            parent1,parent2=self.tournament_selection()
-            offspring1,offspring2=parent1.chromosome.crossover(parent2.chromosome)
-            offspring1.mutation()
-            offspring2.mutation()
-            child_knight1=Knight(offspring1)
-            child_knight2=Knight(offspring2)
-            new_knights.append(child_knight2)
-            new_knights.append(child_knight1)
+        # Double buffered: the children are written into the knights of the
+        # generation before this one, so after the first two generations no
+        # Knight, Chromosome or gene buffer is allocated. Knights of older
+        # generations must not be kept around by callers.
+        # Fitness is read once into a list; selection works on its indices.
+        # If population_size - elitism is odd, the last pair's second child
+        # goes into a scratch chromosome and is dropped.
+        knights = self.knights
+        fitness = [kn.fitness for kn in knights]
+        kept = self.elitism
+        size = self.population_size
+        pairs = (size - kept + 1)//2
+        length = self.width * self.height - 1
+        new_knights = self.spare
+        if new_knights is None or len(new_knights) != size:
+            new_knights = [Knight(Chromosome(bytearray(length)), self.width, self.height,
+                                  self.start, self.rng, self.closed, self.cache)
+                           for _ in range(size)]
+        if (size - kept) % 2 and self.scratch is None:
+            self.scratch = Knight(Chromosome(bytearray(length)), self.width, self.height,
+                                  self.start, self.rng, self.closed)
+        for child_knight, index in zip(new_knights, elite(fitness, kept)):
+            child_knight.chromosome.genes[:] = knights[index].chromosome.genes
+            child_knight.chromosome.version += 1
+            child_knight.fitness=None
+        rng = self.rng
+        parents1, parents2 = self.selection(fitness, pairs, rng)
+        for i in range(pairs):
+            parent1=knights[parents1[i]]
+            parent2=knights[parents2[i]]
+            child_knight2=new_knights[kept + 2 * i]
+            if kept + 2 * i + 1 < size:
+                child_knight1=new_knights[kept + 2 * i + 1]
+            else:
+                child_knight1=self.scratch
+            offspring1=child_knight1.chromosome
+            offspring2=child_knight2.chromosome
+            parent1.chromosome.crossover_into(parent2.chromosome, offspring1, offspring2, rng)
+            offspring1.mutation(rng=rng)
+            offspring2.mutation(rng=rng)
+            child_knight1.fitness=None
+            child_knight2.fitness=None
+        self.spare=knights
         self.knights=new_knights
         self.generation+=1
     
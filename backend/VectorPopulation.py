@@ -0,0 +1,186 @@
+import numpy as np
+from backend.board import check_start, coordinates, neighbor_table, square
+from backend.heuristics import seed_genes
+from backend.memetic import improve_path, path_fitness, write_genes
+from backend.operators import elite, get_crossover, get_selection, mutate
+from backend.rng import RNG, numpy_rng
+
+
+def neighbor_array(width=8, height=8):
+    # [square, direction-1] -> destination square, -1 if off the board
+    return np.array(neighbor_table(width, height), dtype=np.int32)
+
+
+NEIGHBORS = neighbor_array()
+
+
+class VectorPopulation:
+    """Whole population stored as a (population_size, squares - 1) uint8 gene matrix"""
+
+    def __init__(self, population_size, generation=1, genes=None,
+                 seed_fraction=0.0, seed_method="warnsdorff", width=8, height=8,
+                 start=(0, 0), crossover="single_point", selection="tournament",
+                 elitism=0, rng=None, closed=False, prefix_cache=0, memetic=0):
+        # crossover / selection name one of backend.operators.CROSSOVERS /
+        # SELECTIONS; the elitism best individuals are kept unchanged.
+        # rng: a seed, backend.rng.RNG or numpy Generator for every draw.
+        # closed=True: closed full tours score squares + 1 (as in Knight)
+        # memetic > 0: local search on that many fittest tours (as in Population)
+        if prefix_cache:
+            # the whole population is decoded at once, column by column
+            raise ValueError("prefix_cache needs engine='knight'")
+        check_start(start, width, height)
+        self.population_size = population_size
+        self.generation = generation
+        self.width = width
+        self.height = height
+        self.start = start
+        self.crossover = get_crossover(crossover)
+        self.selection = get_selection(selection)
+        self.elitism = elitism
+        self.rng = numpy_rng(rng)
+        self.closed = closed
+        self.memetic = memetic
+        self.neighbors = NEIGHBORS if (width, height) == (8, 8) else neighbor_array(width, height)
+        if genes is None:
+            length = width * height - 1
+            genes = self.rng.integers(1, 9, size=(population_size, length), dtype=np.uint8)
+            seeded = round(population_size * seed_fraction)
+            if seeded:
+                # the heuristics draw from a Python stream split off this one
+                heuristic_rng = RNG(int(self.rng.integers(2 ** 63)))
+                for i in range(seeded):
+                    genes[i] = seed_genes(seed_method, width, height, start, heuristic_rng)
+        self.genes = genes
+        self.paths = None
+        self.fitness = None
+
+    def check_population(self):
+        # Decode, then the memetic stage if it is on
+        self.decode()
+        if self.memetic:
+            self.local_search(self.memetic)
+        return self.fitness
+
+    def decode(self):
+        # Decode every tour at once, one gene column per step. Same rules as
+        # Knight.check_moves: try the gene, then cycle through the other seven
+        # directions (forward or backward, one coin flip per knight) and write
+        # the first valid one back into the genes.
+        # Up to 64 squares the visited set is a uint64 bitboard per knight,
+        # bigger boards use a (population_size, squares) bool matrix.
+        genes = self.genes
+        neighbors = self.neighbors
+        n, length = genes.shape
+        steps = np.arange(8)
+        sign = np.where(self.rng.random(n) < 0.5, 1, -1)
+
+        start = square(*self.start, self.width)
+        position = np.full(n, start, dtype=np.int64)
+        bitboard = length < 64
+        if bitboard:
+            visited = np.full(n, 1 << start, dtype=np.uint64)
+        else:
+            visited = np.zeros((n, length + 1), dtype=bool)
+            visited[:, start] = True
+        paths = np.full((n, length + 1), -1, dtype=np.int32)
+        paths[:, 0] = start
+        fitness = np.ones(n, dtype=np.int64)
+
+        alive = np.arange(n)
+        for i in range(length):
+            if alive.size == 0:
+                break
+            directions = (genes[alive, i].astype(np.int64)[:, None] - 1 + sign[alive, None] * steps) % 8
+            targets = neighbors[position[alive, None], directions]
+            on_board = targets >= 0
+            if bitboard:
+                bits = np.where(on_board, targets, 0).astype(np.uint64)
+                free = ((visited[alive, None] >> bits) & np.uint64(1)) == 0
+            else:
+                free = ~visited[alive[:, None], np.where(on_board, targets, 0)]
+            valid = on_board & free
+
+            found = valid.any(axis=1)
+            first = valid.argmax(axis=1)
+            alive = alive[found]
+            rows = np.flatnonzero(found)
+            new_squares = targets[rows, first[rows]].astype(np.int64)
+
+            genes[alive, i] = directions[rows, first[rows]] + 1
+            position[alive] = new_squares
+            if bitboard:
+                visited[alive] |= np.left_shift(np.uint64(1), new_squares.astype(np.uint64))
+            else:
+                visited[alive, new_squares] = True
+            paths[alive, fitness[alive]] = new_squares
+            fitness[alive] += 1
+
+        if self.closed:
+            full = np.flatnonzero(fitness == length + 1)
+            closes = (neighbors[paths[full, length]] == start).any(axis=1)
+            fitness[full[closes]] += 1
+
+        self.paths = paths
+        self.fitness = fitness
+        return fitness
+
+    def local_search(self, k):
+        # Memetic stage, see Population.local_search; improved rows get the
+        # new moves in their genes, path and fitness
+        target = self.width * self.height + self.closed
+        for index in np.argsort(-self.fitness, kind="stable")[:k]:
+            fitness = int(self.fitness[index])
+            if fitness == target:
+                continue
+            squares = min(fitness, self.paths.shape[1])
+            path = improve_path(self.paths[index, :squares].tolist(), self.width, self.height,
+                                closed=self.closed, rng=self.rng)
+            new_fitness = path_fitness(path, self.width, self.height, self.closed)
+            if new_fitness > fitness:
+                write_genes(self.genes[index], path, self.width, self.height)
+                self.paths[index, :len(path)] = path
+                self.fitness[index] = new_fitness
+
+    def evaluate(self):
+        best_index = int(np.argmax(self.fitness))
+        return int(self.fitness[best_index]), best_index
+
+    def mean_fitness(self):
+        return float(self.fitness.mean())
+
+    def path(self, index):
+        squares = self.paths[index, :min(self.fitness[index], self.paths.shape[1])]
+        return [coordinates(int(square), self.width) for square in squares]
+
+    def complete_paths(self):
+        # Square lists of the full tours, see Population.complete_paths
+        full = np.flatnonzero(self.fitness >= self.width * self.height)
+        return [self.paths[index].tolist() for index in full]
+
+    def best_chromosomes(self, k):
+        # Gene rows of the k fittest individuals (call after evaluate)
+        order = np.argsort(-self.fitness, kind="stable")[:k]
+        return self.genes[order].copy()
+
+    def create_new_generation(self, mutation_rate=0.01):
+        # The elitism fittest rows come first, unchanged, then the children.
+        # An odd number of children drops the last pair's second child.
+        kept = self.elitism
+        pairs = (self.population_size - kept + 1) // 2
+        parent1, parent2 = self.selection(self.fitness, pairs, self.rng)
+        genes1 = self.genes[parent1]
+        genes2 = self.genes[parent2]
+
+        # One call per operator for the whole generation, no loop over pairs
+        child1, child2 = self.crossover(genes1, genes2, self.rng)
+        children = np.empty((self.population_size, genes1.shape[1]), dtype=np.uint8)
+        children[:kept] = self.genes[elite(self.fitness, kept)]
+        children[kept::2] = child2
+        children[kept + 1::2] = child1[:(self.population_size - kept) // 2]
+        mutate(children[kept:], mutation_rate, self.rng)
+
+        self.genes = children
+        self.paths = None
+        self.fitness = None
+        self.generation += 1
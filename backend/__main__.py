@@ -0,0 +1,140 @@
+"""Command line solver, no pygame needed.
+
+    python -m backend --solver genetic --population-size 50 --seed 1 --format json
+"""
+import argparse
+import csv
+import json
+import sys
+
+from backend.board import parse_board, parse_start
+from backend.rng import seed_all
+from backend.solvers import SOLVERS, get_solver
+
+
+def solver_options(args, width, height, metrics=None):
+    start = parse_start(args.start)
+    if args.solver != "genetic":
+        return {"width": width, "height": height, "start": start, "closed": args.closed}
+    return {
+        "population_size": args.population_size,
+        "engine": args.engine,
+        "islands": args.islands,
+        "seed_fraction": args.seed_fraction,
+        "seed_method": args.seed_method,
+        "crossover": args.crossover,
+        "selection": args.selection,
+        "elitism": args.elitism,
+        "prefix_cache": args.prefix_cache,
+        "memetic": args.memetic,
+        "rng": args.seed,
+        "checkpoint": args.checkpoint,
+        "checkpoint_interval": args.checkpoint_interval,
+        "resume": args.resume,
+        "closed": args.closed,
+        "width": width,
+        "height": height,
+        "start": start,
+        "max_generations": args.max_generations,
+        "time_limit": args.time_limit,
+        "stagnation_limit": args.stagnation_limit,
+        "metrics": metrics,
+    }
+
+
+def write_result(result, args, width, height, out):
+    if args.format == "json":
+        json.dump({
+            "solver": args.solver,
+            "width": width,
+            "height": height,
+            "start": list(parse_start(args.start)),
+            "seed": args.seed,
+            "path": [list(position) for position in result.path],
+            "fitness": result.fitness,
+            "complete": result.complete,
+            "generations": result.generations,
+            "execution_time": result.execution_time,
+            "stop_reason": result.stop_reason,
+        }, out)
+        out.write("\n")
+    elif args.format == "csv":
+        writer = csv.writer(out)
+        writer.writerow(["step", "row", "col"])
+        for step, (row, col) in enumerate(result.path, 1):
+            writer.writerow([step, row, col])
+    else:
+        print("Solution path:", result.path, file=out)
+        print("the best fitness :", result.fitness, file=out)
+        print("Execution time:", result.execution_time, "seconds", file=out)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m backend", description="Solve a knight's tour")
+    parser.add_argument("--solver", choices=sorted(SOLVERS), default="genetic")
+    parser.add_argument("--population-size", type=int, default=50)
+    parser.add_argument("--engine", choices=["knight", "vectorized"], default="knight",
+                        help="GA population engine")
+    parser.add_argument("--islands", type=int, default=1)
+    parser.add_argument("--seed-fraction", type=float, default=0.0,
+                        help="part of the initial population seeded with heuristic tours")
+    parser.add_argument("--seed-method", choices=["warnsdorff", "greedy", "structured"],
+                        default="warnsdorff")
+    parser.add_argument("--crossover", default="single_point",
+                        choices=["single_point", "two_point", "uniform", "order"],
+                        help="crossover operator (all but single_point need --engine vectorized)")
+    parser.add_argument("--selection", choices=["tournament", "rank", "sus"],
+                        default="tournament", help="parent selection strategy")
+    parser.add_argument("--elitism", type=int, default=0,
+                        help="fittest knights kept unchanged each generation")
+    parser.add_argument("--prefix-cache", type=int, default=0,
+                        help="decoded gene prefixes to cache (knight engine, at least one "
+                             "generation's worth), default 0: off")
+    parser.add_argument("--memetic", type=int, default=0,
+                        help="fittest tours improved by local search each generation, default 0")
+    parser.add_argument("--board", default="8", help="N or WxH, default 8")
+    parser.add_argument("--closed", action="store_true",
+                        help="closed tour, ending a knight move away from the start")
+    parser.add_argument("--start", default="0,0", help="starting square as row,col")
+    parser.add_argument("--seed", type=int, help="random seed for a reproducible run")
+    parser.add_argument("--max-generations", type=int)
+    parser.add_argument("--time-limit", type=float, help="seconds")
+    parser.add_argument("--stagnation-limit", type=int,
+                        help="generations without improvement before stopping")
+    parser.add_argument("--checkpoint", help="file to save the GA population to, to resume later")
+    parser.add_argument("--checkpoint-interval", type=float, default=60.0,
+                        help="seconds between checkpoints, default 60")
+    parser.add_argument("--resume", action="store_true",
+                        help="continue from --checkpoint if the file exists")
+    parser.add_argument("--metrics", help="file for per-generation GA metrics")
+    parser.add_argument("--metrics-format", choices=["json", "prometheus"], default="json")
+    parser.add_argument("--format", choices=["text", "json", "csv"], default="text")
+    parser.add_argument("--output", help="file to write (default: stdout)")
+    args = parser.parse_args(argv)
+
+    width, height = parse_board(args.board)
+    try:
+        parse_start(args.start, width, height)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.seed is not None:
+        seed_all(args.seed)
+    metrics = None
+    if args.metrics and args.solver == "genetic":
+        from backend.metrics import Metrics
+        metrics = Metrics()
+    result = get_solver(args.solver, **solver_options(args, width, height, metrics)).solve()
+    if metrics is not None:
+        with open(args.metrics, "w") as f:
+            f.write(metrics.to_json() if args.metrics_format == "json" else metrics.to_prometheus())
+
+    if args.output:
+        with open(args.output, "w", newline="") as out:
+            write_result(result, args, width, height, out)
+    else:
+        write_result(result, args, width, height, sys.stdout)
+    return 0 if result.complete else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,25 +1,135 @@
+import os
+import time
 from backend.Population import Population
-import time 
+from backend.budget import Budget
+from backend.islands import island_genetic_algorithm
+from backend.results import GenerationStats, SolveResult
 
-def genetic_algorithm(populationSize):
-    start_time = time.time()
-    population = Population(populationSize)
+def genetic_algorithm(populationSize, engine="knight", islands=1,
+                      migration_interval=10, migration_size=2, workers=None,
+                      seed_fraction=0.0, seed_method="warnsdorff", width=8, height=8,
+                      max_generations=None, time_limit=None, stagnation_limit=None,
+                      cancel=None, start=(0, 0), crossover="single_point",
+                      selection="tournament", elitism=0, rng=None, checkpoint=None,
+                      checkpoint_interval=60.0, resume=False, closed=False, metrics=None,
+                      prefix_cache=0, memetic=0):
+    # engine="knight" runs the Knight/Chromosome objects, engine="vectorized"
+    # decodes the whole population at once with NumPy (needs numpy installed).
+    # crossover picks the operator by name: "single_point" for both engines,
+    # "two_point", "uniform" or "order" with the vectorized one.
+    # selection is "tournament", "rank" or "sus" (stochastic universal
+    # sampling); the elitism fittest knights survive each generation unchanged.
+    # rng is a seed or backend.rng.RNG drawing every random number of the run
+    # (None: seeded from the global random module, see backend.rng.seed_all).
+    # checkpoint is a file the population is saved to every checkpoint_interval
+    # seconds and when a limit stops the run (see backend.checkpoint); with
+    # resume=True the run continues from that file if it exists.
+    # closed=True asks for a closed tour (ending a knight move from start):
+    # those score width * height + 1 and only they solve the run.
+    # metrics (a backend.metrics.Metrics) records timings, repairs and fitness
+    # distributions of every generation.
+    # prefix_cache > 0 (knight engine) caches that many decoded gene prefixes,
+    # see backend.prefix_cache; it saves time without changing the result.
+    # memetic > 0 adds local search (backend.memetic) on that many of the
+    # fittest tours of every generation.
+    # islands > 1 runs that many populations in separate processes.
+    # seed_fraction of the initial population gets heuristic genes (seed_method).
+    # The board is width x height, solved once a knight starting on the
+    # (row, col) square start visits every square.
+    # max_generations / time_limit (seconds) / stagnation_limit (generations
+    # without improvement) / cancel (an Event) end the run early; the result
+    # is then the best partial tour found so far.
+    # Returns a SolveResult: (path, execution_time) plus fitness, generations,
+    # complete and stop_reason.
+    if islands > 1:
+        if checkpoint is not None or metrics is not None:
+            raise ValueError("checkpoints and metrics need a single population (islands=1)")
+        budget = Budget(width * height + closed, max_generations, time_limit, stagnation_limit,
+                        cancel)
+        return island_genetic_algorithm(populationSize, islands, migration_interval,
+                                        migration_size, engine, workers, budget,
+                                        seed_fraction=seed_fraction, seed_method=seed_method,
+                                        width=width, height=height, start=start,
+                                        crossover=crossover, selection=selection,
+                                        elitism=elitism, rng=rng, closed=closed,
+                                        prefix_cache=prefix_cache, memetic=memetic)
+
+    for stats in iter_generations(populationSize, engine=engine, seed_fraction=seed_fraction,
+                                  seed_method=seed_method, width=width, height=height,
+                                  max_generations=max_generations, time_limit=time_limit,
+                                  stagnation_limit=stagnation_limit, cancel=cancel,
+                                  start=start, crossover=crossover, selection=selection,
+                                  elitism=elitism, rng=rng, checkpoint=checkpoint,
+                                  checkpoint_interval=checkpoint_interval, resume=resume,
+                                  closed=closed, metrics=metrics,
+                                  prefix_cache=prefix_cache, memetic=memetic):
+        pass
+    return SolveResult(stats.best_path, stats.elapsed, stats.generation,
+                       stats.best_fitness == width * height + closed, stats.stop_reason)
+
+
+def iter_generations(populationSize, engine="knight", seed_fraction=0.0,
+                     seed_method="warnsdorff", width=8, height=8, max_generations=None,
+                     time_limit=None, stagnation_limit=None, cancel=None, start=(0, 0),
+                     crossover="single_point", selection="tournament", elitism=0,
+                     rng=None, checkpoint=None, checkpoint_interval=60.0, resume=False,
+                     closed=False, metrics=None, prefix_cache=0, memetic=0):
+    # Same run as genetic_algorithm (single population), yielding a
+    # GenerationStats after every generation. The last one has stop_reason set.
+    population_options = {"seed_fraction": seed_fraction, "seed_method": seed_method,
+                          "width": width, "height": height, "start": start,
+                          "crossover": crossover, "selection": selection,
+                          "elitism": elitism, "closed": closed,
+                          "prefix_cache": prefix_cache, "memetic": memetic}
+    budget = Budget(width * height + closed, max_generations, time_limit, stagnation_limit, cancel)
+    if engine not in ("knight", "vectorized"):
+        raise ValueError(f"Unknown engine: {engine}")
+    if resume and checkpoint is not None and os.path.exists(checkpoint):
+        from backend.checkpoint import resume_population
+        population = resume_population(checkpoint, engine, populationSize, budget,
+                                       **population_options)
+    elif engine == "vectorized":
+        from backend.VectorPopulation import VectorPopulation
+        population = VectorPopulation(populationSize, rng=rng, **population_options)
+    else:
+        population = Population(populationSize, rng=rng, **population_options)
+    if checkpoint is not None:
+        from backend.checkpoint import write_checkpoint
+        next_checkpoint = time.time() + checkpoint_interval
 
     while True:
-        population.check_population()
-        best_fitness,best_knight=population.evaluate()
-        
-        if best_fitness==64:
-            end_time = time.time()
-            execution_time = end_time - start_time
-            return best_knight.path, execution_time
+        # Checkpoints are taken before a generation is evaluated, so a resumed
+        # run draws the same random numbers as an uninterrupted one
+        if checkpoint is not None and time.time() >= next_checkpoint:
+            write_checkpoint(checkpoint, population, budget)
+            next_checkpoint = time.time() + checkpoint_interval
+        if metrics is None:
+            population.check_population()
+            best_fitness,best_knight=population.evaluate()
         else:
-            population.create_new_generation()
+            best_fitness,best_knight=metrics.measure_evaluation(population)
+        budget.record(best_fitness, lambda: population.path(best_knight))
 
-        
+        stop_reason = budget.stop_reason(population.generation)
+        yield GenerationStats(population.generation, budget.best_fitness,
+                              population.mean_fitness(), budget.best_path,
+                              budget.elapsed(), stop_reason)
+        if stop_reason:
+            if checkpoint is not None and stop_reason != "solved":
+                # save the next generation, to go on with bigger limits
+                population.create_new_generation()
+                write_checkpoint(checkpoint, population, budget)
+            if metrics is not None:
+                metrics.finish()
+            return
+        if metrics is None:
+            population.create_new_generation()
+        else:
+            metrics.measure_variation(population)
 
-path, exec_time = genetic_algorithm(50)
 
-print("Solution path:", path)
-print("the best fitness :", len(path))
-print("Execution time:", exec_time, "seconds")
\ No newline at end of file
+def stream_generations(queue, populationSize, **options):
+    # Run iter_generations and put every GenerationStats on a thread-safe
+    # queue (queue.Queue), e.g. from a background thread feeding the GUI
+    for stats in iter_generations(populationSize, **options):
+        queue.put(stats)
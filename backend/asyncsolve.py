@@ -0,0 +1,86 @@
+"""asyncio interface to the solvers; the CPU work runs in worker processes.
+
+    result = await solve_async("warnsdorff", width=10, height=10)
+
+    async with AsyncSolver(workers=4) as solver:
+        results = await asyncio.gather(
+            solver.solve("genetic", progress=print, seed_fraction=0.1),
+            solver.solve("backtracking", width=6, height=6))
+
+Cancelling the awaiting task stops the solver at its next cancellation check
+(every generation for the GA) and frees its worker.
+"""
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from backend.results import SolveResult
+from backend.solvers import get_solver
+
+_DONE = None  # put on the progress queue after the last GenerationStats
+
+
+def _stream(name, options, queue, cancel):
+    # Runs in a worker process
+    try:
+        get_solver(name, cancel=cancel, **options).stream(queue)
+    finally:
+        queue.put(_DONE)
+
+
+class AsyncSolver:
+    """Worker processes, plus a multiprocessing manager for the progress
+    queues and cancel events crossing to them. Any number of solve() calls
+    may be in flight, `workers` of them run at a time."""
+
+    def __init__(self, workers=None):
+        self.executor = ProcessPoolExecutor(workers)
+        self.manager = multiprocessing.Manager()
+
+    async def solve(self, solver="genetic", progress=None, **options):
+        # options go to get_solver (not cancel: cancel the task instead).
+        # progress(stats) is called in the event loop with every
+        # GenerationStats (only the last one for solvers without
+        # generations); it may be a coroutine function.
+        loop = asyncio.get_running_loop()
+        queue = self.manager.Queue()
+        cancel = self.manager.Event()
+        future = loop.run_in_executor(self.executor, _stream, solver, options, queue, cancel)
+        stats = None
+        try:
+            while True:
+                # Blocks a thread of the loop's default executor, not the loop
+                item = await loop.run_in_executor(None, queue.get)
+                if item is _DONE:
+                    break
+                stats = item
+                if progress is not None:
+                    waiting = progress(stats)
+                    if asyncio.iscoroutine(waiting):
+                        await waiting
+            await future  # raises what the solver raised
+        except asyncio.CancelledError:
+            cancel.set()
+            raise
+        return SolveResult(stats.best_path, stats.elapsed, stats.generation,
+                           stats.stop_reason == "solved", stats.stop_reason)
+
+    def close(self):
+        # Doesn't wait for the workers: cancelled solves finish on their own
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.manager.shutdown()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.close()
+
+
+async def solve_async(solver="genetic", progress=None, **options):
+    # One solve in a worker process of its own, see AsyncSolver.solve
+    runner = AsyncSolver(1)
+    try:
+        return await runner.solve(solver, progress, **options)
+    finally:
+        runner.close()
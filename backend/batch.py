@@ -0,0 +1,184 @@
+"""Solve many tours at once over a process pool, with an on-disk result cache.
+
+    python -m backend.batch jobs.json --cache-dir .tour-cache --workers 8
+
+jobs.json is a list of job objects, e.g.
+    [{"start": [0, 0], "width": 8, "height": 8, "seed": 1, "solver": "genetic",
+      "options": {"population_size": 50}}]
+Results are printed as one JSON line per job, in completion order.
+"""
+import argparse
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import hashlib
+import json
+import os
+import sys
+import tempfile
+
+from backend.results import SolveResult
+from backend.rng import seed_all
+from backend.solvers import get_solver
+
+# One tour to solve. options go to the solver (population_size, budgets, ...)
+Job = namedtuple("Job", ["start", "width", "height", "seed", "solver", "options"],
+                 defaults=[(0, 0), 8, 8, None, "genetic", None])
+
+
+def job_from_dict(data):
+    job = Job(**data)
+    return job._replace(start=tuple(job.start))
+
+
+def job_key(job):
+    # Stable cache key over every parameter of the job
+    params = {
+        "start": list(job.start), "width": job.width, "height": job.height,
+        "seed": job.seed, "solver": job.solver, "options": job.options or {},
+    }
+    text = json.dumps(params, sort_keys=True)
+    return hashlib.sha1(text.encode()).hexdigest()
+
+
+def solve_job(job):
+    # Runs in a worker process
+    if job.seed is not None:
+        seed_all(job.seed)
+    solver = get_solver(job.solver, width=job.width, height=job.height, start=job.start,
+                        **(job.options or {}))
+    return solver.solve()
+
+
+class TourCache:
+    """Finished tours on disk, one JSON file per job, least recently used evicted first"""
+
+    def __init__(self, directory, max_bytes=64 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+        # Running size of the cache: the directory is only scanned when it
+        # goes over max_bytes (and once here)
+        self.total = self.scan()[1]
+
+    def _file(self, job):
+        return os.path.join(self.directory, job_key(job) + ".json")
+
+    def get(self, job):
+        filename = self._file(job)
+        try:
+            with open(filename) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        os.utime(filename)  # mark as recently used
+        return SolveResult([tuple(p) for p in data["path"]], data["execution_time"],
+                           data["generations"], data["complete"], data["stop_reason"])
+
+    def put(self, job, result):
+        data = {
+            "path": [list(p) for p in result.path],
+            "execution_time": result.execution_time,
+            "generations": result.generations,
+            "complete": result.complete,
+            "stop_reason": result.stop_reason,
+        }
+        # Write then rename, so readers never see a half written file
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f)
+            size = f.tell()
+        filename = self._file(job)
+        try:
+            self.total -= os.path.getsize(filename)   # replaced
+        except OSError:
+            pass
+        os.replace(tmp, filename)
+        self.total += size
+        if self.total > self.max_bytes:
+            self.evict()
+
+    def scan(self):
+        # ([(mtime, size, path)] of the cached files, total size)
+        entries = []
+        total = 0
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".json"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+        return entries, total
+
+    def evict(self):
+        # The sizes are read again, other processes may share the directory
+        entries, total = self.scan()
+        entries.sort()
+        for _mtime, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
+        self.total = total
+
+
+def solve_batch(jobs, workers=None, cache=None):
+    # Yield (job, result) pairs as they finish: cached jobs first, then the
+    # rest from a pool of `workers` processes. New complete tours go into the
+    # cache; partial ones (stopped by a time limit, stagnation, ...) depend
+    # on timing and are solved again next time.
+    pending = []
+    for job in jobs:
+        result = cache.get(job) if cache is not None else None
+        if result is not None:
+            yield job, result
+        else:
+            pending.append(job)
+    if not pending:
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(solve_job, job): job for job in pending}
+        for future in as_completed(futures):
+            job = futures[future]
+            result = future.result()
+            if cache is not None and result.complete:
+                cache.put(job, result)
+            yield job, result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m backend.batch",
+                                     description="Solve a batch of knight's tours")
+    parser.add_argument("jobs", help="JSON file with a list of jobs ('-' for stdin)")
+    parser.add_argument("--workers", type=int, help="worker processes (default: CPU count)")
+    parser.add_argument("--cache-dir", help="directory of the result cache (default: no cache)")
+    parser.add_argument("--cache-size", type=int, default=64,
+                        help="cache size limit in MB, default 64")
+    args = parser.parse_args(argv)
+
+    if args.jobs == "-":
+        jobs = [job_from_dict(data) for data in json.load(sys.stdin)]
+    else:
+        with open(args.jobs) as f:
+            jobs = [job_from_dict(data) for data in json.load(f)]
+    cache = None
+    if args.cache_dir:
+        cache = TourCache(args.cache_dir, args.cache_size * 1024 * 1024)
+
+    for job, result in solve_batch(jobs, args.workers, cache):
+        print(json.dumps({
+            "job": job._asdict(),
+            "path": [list(p) for p in result.path],
+            "fitness": result.fitness,
+            "complete": result.complete,
+            "generations": result.generations,
+            "execution_time": result.execution_time,
+            "stop_reason": result.stop_reason,
+        }), flush=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
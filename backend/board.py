@@ -0,0 +1,90 @@
+from functools import lru_cache
+
+BOARD_SIZE = 8
+
+# Knight move deltas for directions 1..8 (index 0..7)
+DELTAS = (
+    (1, 2),    # DOWN-right
+    (2, 1),    # RIGHT-down
+    (2, -1),   # RIGHT-up
+    (1, -2),   # UP-right
+    (-1, -2),  # UP-left
+    (-2, -1),  # LEFT-up
+    (-2, 1),   # LEFT-down
+    (-1, 2),   # DOWN-left
+)
+
+# Boards are width x height: x (the row) is in range(height), y (the column)
+# in range(width), and square index = x * width + y
+
+
+def square(x, y, width=BOARD_SIZE):
+    return x * width + y
+
+
+def coordinates(sq, width=BOARD_SIZE):
+    return sq // width, sq % width
+
+
+@lru_cache(maxsize=None)
+def neighbor_table(width=BOARD_SIZE, height=BOARD_SIZE):
+    # table[square][direction-1] -> destination square, or -1 if off the board
+    table = []
+    for x in range(height):
+        for y in range(width):
+            row = []
+            for dx, dy in DELTAS:
+                nx, ny = x + dx, y + dy
+                if 0 <= nx < height and 0 <= ny < width:
+                    row.append(square(nx, ny, width))
+                else:
+                    row.append(-1)
+            table.append(tuple(row))
+    return tuple(table)
+
+
+def parse_board(text):
+    # "8" -> 8x8, "6x10" -> width 6, height 10
+    if "x" in text:
+        width, height = text.split("x")
+        return int(width), int(height)
+    return int(text), int(text)
+
+
+def check_start(start, width=BOARD_SIZE, height=BOARD_SIZE):
+    # ValueError unless start (row, col) is a square of the board
+    row, col = start
+    if not (0 <= row < height and 0 <= col < width):
+        raise ValueError(f"start {row},{col} is not on the {width}x{height} board")
+
+
+def parse_start(text, width=None, height=None):
+    # "row,col" -> (row, col), checked against the board if width is given
+    try:
+        row, col = (int(n) for n in text.split(","))
+    except ValueError:
+        raise ValueError(f"start {text!r} is not row,col") from None
+    if width is not None:
+        check_start((row, col), width, height or width)
+    return row, col
+
+
+def path_typecode(width=BOARD_SIZE, height=BOARD_SIZE):
+    # Smallest array typecode that holds every square index of the board
+    squares = width * height
+    if squares <= 128:
+        return 'b'
+    if squares <= 65536:
+        return 'H'
+    return 'l'
+
+
+def is_tour(path, width=BOARD_SIZE, height=BOARD_SIZE, closed=False):
+    # True if path (square indices) visits every square once by knight moves,
+    # and with closed=True also ends a knight move away from its start
+    neighbors = neighbor_table(width, height)
+    if len(path) != width * height or len(set(path)) != len(path):
+        return False
+    if any(b not in neighbors[a] for a, b in zip(path, path[1:])):
+        return False
+    return not closed or path[0] in neighbors[path[-1]]
@@ -0,0 +1,54 @@
+import time
+
+
+class Budget:
+    """Best-so-far tracking plus the limits that end a GA run early"""
+
+    def __init__(self, squares, max_generations=None, time_limit=None,
+                 stagnation_limit=None, cancel=None):
+        # squares: the fitness of a solution (squares on the board, + 1 for
+        # closed tours)
+        # max_generations: stop after that many generations
+        # time_limit: stop after that many seconds
+        # stagnation_limit: stop after that many generations without improvement
+        # cancel: any object with is_set() (threading.Event, ...) to stop on demand
+        self.start_time = time.time()
+        self.squares = squares
+        self.max_generations = max_generations
+        self.time_limit = time_limit
+        self.stagnation_limit = stagnation_limit
+        self.cancel = cancel
+        self.best_fitness = 0
+        self.best_path = []
+        self.stale = 0
+
+    def deadline(self):
+        if self.time_limit is None:
+            return None
+        return self.start_time + self.time_limit
+
+    def elapsed(self):
+        return time.time() - self.start_time
+
+    def record(self, fitness, path, generations=1):
+        # path may be a callable so it is only built on improvement
+        if fitness > self.best_fitness:
+            self.best_fitness = fitness
+            self.best_path = path() if callable(path) else path
+            self.stale = 0
+        else:
+            self.stale += generations
+
+    def stop_reason(self, generation):
+        # Why the run should stop after `generation` generations, or None
+        if self.best_fitness == self.squares:
+            return "solved"
+        if self.cancel is not None and self.cancel.is_set():
+            return "cancelled"
+        if self.max_generations is not None and generation >= self.max_generations:
+            return "max_generations"
+        if self.time_limit is not None and self.elapsed() >= self.time_limit:
+            return "time_limit"
+        if self.stagnation_limit is not None and self.stale >= self.stagnation_limit:
+            return "stagnation"
+        return None
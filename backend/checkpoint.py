@@ -0,0 +1,122 @@
+"""Checkpoints of a running GA population, to resume long runs.
+
+File layout: the 8 byte magic, the header length (uint32, little endian),
+a JSON header (generation, board, RNG state, best so far, ...), padding to a
+multiple of 64 bytes, then the gene matrix as raw bytes, one row of
+squares - 1 genes per individual.
+"""
+import json
+import mmap
+import os
+import struct
+import tempfile
+import time
+
+from backend.Chromosome import Chromosome
+from backend.Knight import Knight
+from backend.Population import Population
+from backend.rng import rng_from_state, rng_state
+
+MAGIC = b"KTGACKP1"
+ALIGN = 64
+
+
+def write_checkpoint(filename, population, budget):
+    # The genes are written straight from the population's own buffers
+    # (the bytearrays of the knights, or the NumPy matrix) without copies.
+    # Written to a temporary file then renamed, so a crash mid-write leaves
+    # the previous checkpoint intact.
+    if hasattr(population, "knights"):
+        engine = "knight"
+        rows = [kn.chromosome.genes for kn in population.knights]
+    else:
+        engine = "vectorized"
+        genes = population.genes
+        rows = [genes.data if genes.flags.c_contiguous else genes.tobytes()]
+    header = json.dumps({
+        "engine": engine,
+        "generation": population.generation,
+        "population_size": population.population_size,
+        "individuals": len(population.knights) if engine == "knight" else population.genes.shape[0],
+        "length": population.width * population.height - 1,
+        "width": population.width,
+        "height": population.height,
+        "start": list(population.start),
+        "closed": population.closed,
+        "rng": rng_state(population.rng),
+        "best_fitness": budget.best_fitness,
+        "best_path": [list(p) for p in budget.best_path],
+        "stale": budget.stale,
+        "elapsed": budget.elapsed(),
+    }).encode()
+    offset = len(MAGIC) + 4 + len(header)
+    padding = b" " * (-offset % ALIGN)
+
+    directory = os.path.dirname(os.path.abspath(filename))
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(MAGIC)
+            f.write(struct.pack("<I", len(header) + len(padding)))
+            f.write(header)
+            f.write(padding)
+            f.writelines(rows)
+        os.replace(tmp, filename)
+    except BaseException:
+        os.remove(tmp)
+        raise
+
+
+def read_checkpoint(filename):
+    # Returns (header, genes): genes is a writable memoryview of
+    # individuals * length bytes over a private (copy on write) memory map
+    # of the file, so nothing is read until it is used.
+    with open(filename, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{filename} is not a GA checkpoint")
+        (size,) = struct.unpack("<I", f.read(4))
+        header = json.loads(f.read(size))
+        offset = len(MAGIC) + 4 + size
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+    count = header["individuals"] * header["length"]
+    if len(mapped) < offset + count:
+        raise ValueError(f"{filename} is truncated")
+    return header, memoryview(mapped)[offset:offset + count]
+
+
+def resume_population(filename, engine, population_size, budget, **options):
+    # Population (engine "knight" or "vectorized") continuing from a
+    # checkpoint, with budget's best so far, stagnation and elapsed time
+    # restored. options are the usual population options; the board, start
+    # square and closed must match the checkpoint (best fitness and the
+    # target depend on closed).
+    header, genes = read_checkpoint(filename)
+    board = (options.get("width", 8), options.get("height", 8), list(options.get("start", (0, 0))),
+             bool(options.get("closed", False)))
+    saved = (header["width"], header["height"], header["start"], header.get("closed", False))
+    if header["engine"] != engine or board != saved:
+        tour = "closed" if saved[3] else "open"
+        raise ValueError(f"{filename} is a checkpoint of another run "
+                         f"({header['engine']}, {header['width']}x{header['height']}, {tour} tour)")
+    rng = rng_from_state(header["rng"])
+    length = header["length"]
+    if engine == "vectorized":
+        import numpy as np
+        from backend.VectorPopulation import VectorPopulation
+        matrix = np.frombuffer(genes, dtype=np.uint8).reshape(header["individuals"], length)
+        population = VectorPopulation(population_size, header["generation"], matrix,
+                                      rng=rng, **options)
+    else:
+        width, height, start = header["width"], header["height"], tuple(header["start"])
+        closed = options.get("closed", False)
+        knights = [Knight(Chromosome(bytearray(genes[i:i + length])), width, height, start,
+                          rng, closed)
+                   for i in range(0, len(genes), length)]
+        population = Population(population_size, header["generation"], knights,
+                                rng=rng, **options)
+
+    budget.best_fitness = header["best_fitness"]
+    budget.best_path = [tuple(p) for p in header["best_path"]]
+    budget.stale = header["stale"]
+    budget.start_time = time.time() - header["elapsed"]
+    return population
@@ -0,0 +1,112 @@
+import random
+from backend.board import neighbor_table, square
+
+
+def _degrees(neighbors, visited):
+    # Number of unvisited squares reachable from every square
+    return [sum(1 for t in moves if t >= 0 and not (visited >> t) & 1) for moves in neighbors]
+
+
+def warnsdorff_tour(start=0, randomize=False, noise=0.0, width=8, height=8, rng=random):
+    # Warnsdorff's rule: always jump to the square with the fewest onward
+    # moves. Ties go to the lowest direction, or a random one if randomize.
+    # With noise > 0 that fraction of the moves is a random valid one instead
+    # (randomized greedy). Returns the list of squares, shorter than
+    # width * height if the walk got stuck.
+    neighbors = neighbor_table(width, height)
+    visited = 1 << start
+    degrees = _degrees(neighbors, visited)
+    path = [start]
+    square = start
+    while True:
+        best = None
+        best_degree = 9
+        ties = 0
+        pick_random = noise and rng.random() < noise
+        for target in neighbors[square]:
+            if target < 0 or (visited >> target) & 1:
+                continue
+            degree = 0 if pick_random else degrees[target]
+            if degree < best_degree:
+                best, best_degree, ties = target, degree, 1
+            elif degree == best_degree and randomize:
+                ties += 1
+                if rng.randrange(ties) == 0:
+                    best = target
+        if best is None:
+            return path
+        visited |= 1 << best
+        for target in neighbors[best]:
+            if target >= 0:
+                degrees[target] -= 1
+        square = best
+        path.append(square)
+
+
+def backtracking_tour(start=0, width=8, height=8, cancel=None, closed=False):
+    # Depth-first search with Warnsdorff move ordering. Complete: returns a
+    # full tour of the board (None if none exists from start, or if the
+    # cancel event was set, checked every 4096 moves).
+    # closed=True only accepts tours ending a knight move away from start,
+    # and backtracks as soon as all the squares next to start are taken.
+    neighbors = neighbor_table(width, height)
+    squares = width * height
+    ends = [t for t in neighbors[start] if t >= 0]  # last squares of a closed tour
+    visited = 1 << start
+    path = [start]
+    # One list of remaining candidates per depth, best candidate last
+    stack = [_ordered_moves(neighbors, start, visited)]
+    steps = 0
+    while stack:
+        steps += 1
+        if cancel is not None and steps % 4096 == 0 and cancel.is_set():
+            return None
+        if len(path) == squares and (not closed or path[-1] in ends):
+            return path
+        candidates = stack[-1]
+        if not candidates:
+            stack.pop()
+            visited &= ~(1 << path.pop())
+            continue
+        target = candidates.pop()
+        visited |= 1 << target
+        path.append(target)
+        if closed and len(path) < squares and all((visited >> t) & 1 for t in ends):
+            visited &= ~(1 << path.pop())
+            continue
+        stack.append(_ordered_moves(neighbors, target, visited))
+    return None
+
+
+def _ordered_moves(neighbors, square, visited):
+    moves = [t for t in neighbors[square] if t >= 0 and not (visited >> t) & 1]
+    onward = {t: sum(1 for n in neighbors[t] if n >= 0 and not (visited >> n) & 1) for t in moves}
+    moves.sort(key=lambda t: onward[t], reverse=True)
+    return moves
+
+
+def genes_from_path(path, width=8, height=8, rng=random):
+    # Direction genes (1..8) that replay path, padded with random genes
+    neighbors = neighbor_table(width, height)
+    length = width * height - 1
+    genes = [neighbors[a].index(b) + 1 for a, b in zip(path, path[1:])]
+    while len(genes) < length:
+        genes.append(rng.randint(1, 8))
+    return genes
+
+
+def seed_genes(method="warnsdorff", width=8, height=8, start=(0, 0), rng=random):
+    # Heuristic starting genes for the GA population. "structured" is the
+    # closed tour of backend.structured (even boards of at least 6x6).
+    start = square(*start, width)
+    if method == "structured":
+        from backend.structured import structured_tour
+        tour = structured_tour(width, height, start)
+    elif method == "warnsdorff":
+        tour = warnsdorff_tour(start, randomize=True, width=width, height=height, rng=rng)
+    elif method == "greedy":
+        tour = warnsdorff_tour(start, randomize=True, noise=0.2, width=width, height=height,
+                               rng=rng)
+    else:
+        raise ValueError(f"Unknown seed method: {method}")
+    return genes_from_path(tour, width, height, rng)
@@ -0,0 +1,158 @@
+from concurrent.futures import ProcessPoolExecutor, wait
+import multiprocessing
+import os
+import time
+from backend.Chromosome import Chromosome
+from backend.Knight import Knight
+from backend.Population import Population
+from backend.budget import Budget
+from backend.results import SolveResult
+from backend.rng import make_rng
+
+# Set in every worker by _init_worker, shared by all islands of one run:
+# the stop event (cancellation) and the earliest generation in which an
+# island found a full tour
+_stop_event = None
+_solved_at = None
+
+
+def _init_worker(stop_event, solved_at):
+    global _stop_event, _solved_at
+    _stop_event = stop_event
+    _solved_at = solved_at
+
+
+def _make_population(engine, population_size, generation, genes, rng, options):
+    if engine == "vectorized":
+        from backend.VectorPopulation import VectorPopulation
+        return VectorPopulation(population_size, generation, genes, rng=rng, **options)
+    if genes is None:
+        return Population(population_size, generation, rng=rng, **options)
+    width = options.get("width", 8)
+    height = options.get("height", 8)
+    start = options.get("start", (0, 0))
+    closed = options.get("closed", False)
+    knights = [Knight(Chromosome(g), width, height, start, rng, closed) for g in genes]
+    return Population(population_size, generation, knights, rng=rng, **options)
+
+
+def _run_island(engine, population_size, generation, genes, rng, generations, migration_size,
+                deadline, options):
+    # Run one island for up to `generations` generations (or until deadline).
+    # Returns the next generation's genes, the emigrants picked from the last
+    # evaluated one, the island's best path and its random stream (rng) to
+    # continue from. An island that finds a full tour records its generation
+    # in _solved_at; islands only stop once they are past that generation, so
+    # the earliest solution is always found whatever the process scheduling.
+    population = _make_population(engine, population_size, generation, genes, rng, options)
+    target = population.width * population.height + population.closed  # solved fitness
+    emigrants = []
+    best_fitness = 0
+    best_path = []
+    solved = None
+    evaluated = generation - 1  # last generation this island evaluated
+    for _ in range(generations):
+        if _stop_event.is_set() or (deadline is not None and time.time() >= deadline):
+            break
+        if population.generation > _solved_at.value:
+            break
+        population.check_population()
+        fitness, best_knight = population.evaluate()
+        evaluated = population.generation
+        if fitness > best_fitness:
+            best_fitness = fitness
+            best_path = population.path(best_knight)
+        if fitness == target:
+            solved = population.generation
+            with _solved_at.get_lock():
+                _solved_at.value = min(_solved_at.value, solved)
+            break
+        emigrants = population.best_chromosomes(migration_size)
+        population.create_new_generation()
+
+    if engine == "vectorized":
+        genes = population.genes
+    else:
+        genes = [kn.chromosome.genes for kn in population.knights]
+    return {
+        "generation": population.generation,
+        "evaluated": evaluated,
+        "genes": genes,
+        "emigrants": emigrants,
+        "best_fitness": best_fitness,
+        "best_path": best_path,
+        "solved": solved,
+        "rng": population.rng,
+    }
+
+
+def island_genetic_algorithm(populationSize, islands=4, migration_interval=10,
+                             migration_size=2, engine="knight", workers=None,
+                             budget=None, rng=None, **population_options):
+    # Island model: `islands` independent populations of populationSize run in
+    # a process pool. Every migration_interval generations each island sends
+    # its migration_size best chromosomes to the next island (ring topology),
+    # replacing that island's last children. The first full tour stops them all.
+    # Every island draws from its own stream spawned from rng (a seed or
+    # backend.rng.RNG), so without a time limit or cancellation a seed gives
+    # the same result for any number of workers.
+    # budget (a Budget) limits the run, checked per island generation for the
+    # time limit and cancellation, and between migrations for the rest.
+    # population_options (seed_fraction, ...) go to each island's population.
+    target = (population_options.get("width", 8) * population_options.get("height", 8)
+              + population_options.get("closed", False))
+    if budget is None:
+        budget = Budget(target)
+    if workers is None:
+        workers = min(islands, os.cpu_count() or 1)
+    stop_event = multiprocessing.Event()
+    solved_at = multiprocessing.Value("q", 2 ** 62)
+    genes = [None] * islands
+    generations = [1] * islands
+    streams = make_rng(rng).spawn(islands)
+    if engine == "vectorized":
+        streams = [stream.numpy() for stream in streams]
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(stop_event, solved_at)) as pool:
+        while True:
+            epoch = migration_interval
+            if budget.max_generations is not None:
+                epoch = min(epoch, budget.max_generations - generations[0] + 1)
+            futures = [
+                pool.submit(_run_island, engine, populationSize, generations[i],
+                            genes[i], streams[i], epoch, migration_size, budget.deadline(),
+                            population_options)
+                for i in range(islands)
+            ]
+            # Poll so a cancel request reaches the workers mid-epoch
+            pending = futures
+            while pending:
+                done, pending = wait(pending, timeout=0.1)
+                if budget.cancel is not None and budget.cancel.is_set():
+                    stop_event.set()
+            results = [future.result() for future in futures]
+
+            solutions = [(result["solved"], i) for i, result in enumerate(results)
+                         if result["solved"] is not None]
+            if solutions:
+                # earliest generation, then lowest island
+                generation, i = min(solutions)
+                best = results[i]
+            else:
+                best = max(results, key=lambda result: result["best_fitness"])
+                generation = max(result["evaluated"] for result in results)
+            budget.record(best["best_fitness"], best["best_path"], generation - generations[0] + 1)
+
+            stop_reason = budget.stop_reason(generation)
+            if stop_reason:
+                return SolveResult(budget.best_path, budget.elapsed(), generation,
+                                   budget.best_fitness == target, stop_reason)
+
+            for i, result in enumerate(results):
+                island_genes = result["genes"]
+                emigrants = results[i - 1]["emigrants"]
+                island_genes[len(island_genes) - len(emigrants):] = emigrants
+                genes[i] = island_genes
+                generations[i] = result["generation"]
+                streams[i] = result["rng"]
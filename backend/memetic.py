@@ -0,0 +1,80 @@
+import random
+from backend.board import neighbor_table
+
+
+def _extend(path, visited, neighbors, index):
+    # Warnsdorff tail completion: keep jumping to the free square with the
+    # fewest free onward squares (lowest direction on ties)
+    square = path[-1]
+    while True:
+        best = None
+        best_degree = 9
+        for target in neighbors[square]:
+            if target < 0 or (visited >> target) & 1:
+                continue
+            degree = sum(1 for t in neighbors[target] if t >= 0 and not (visited >> t) & 1)
+            if degree < best_degree:
+                best, best_degree = target, degree
+        if best is None:
+            return visited
+        visited |= 1 << best
+        index[best] = len(path)
+        path.append(best)
+        square = best
+
+
+def improve_path(path, width=8, height=8, steps=None, closed=False, rng=random):
+    # Bounded local search on a partial tour (squares, path[0] the start):
+    # extend the tail with Warnsdorff's rule, and when it is stuck make a
+    # backbite move. The end square jumps to one of its path neighbours
+    # path[i] and the part after it is reversed, so path[i + 1] becomes the
+    # new end with the same squares visited. New ends with a free neighbour
+    # are preferred. Stops after `steps` backbites (default: one per square),
+    # on a full tour, or for closed=True on a full tour ending a knight move
+    # from the start. Returns a new list, at least as long as path.
+    neighbors = neighbor_table(width, height)
+    squares = len(neighbors)
+    if steps is None:
+        steps = squares
+    path = list(path)
+    index = {}
+    visited = 0
+    for i, sq in enumerate(path):
+        index[sq] = i
+        visited |= 1 << sq
+    start = path[0]
+    for _ in range(steps + 1):
+        visited = _extend(path, visited, neighbors, index)
+        if len(path) == squares and (not closed or start in neighbors[path[-1]]):
+            break
+        last = len(path) - 1
+        candidates = [index[t] + 1 for t in neighbors[path[-1]]
+                      if t >= 0 and (visited >> t) & 1 and index[t] < last - 1]
+        if not candidates:
+            break
+        free = [i for i in candidates
+                if any(t >= 0 and not (visited >> t) & 1 for t in neighbors[path[i]])]
+        if free:
+            candidates = free
+        i = candidates[int(rng.random() * len(candidates))]
+        path[i:] = path[:i - 1:-1]
+        for j in range(i, len(path)):
+            index[path[j]] = j
+    return path
+
+
+def path_fitness(path, width=8, height=8, closed=False):
+    # Same score as Knight.check_moves gives a decoded path
+    neighbors = neighbor_table(width, height)
+    fitness = len(path)
+    if closed and fitness == len(neighbors) and path[0] in neighbors[path[-1]]:
+        fitness += 1
+    return fitness
+
+
+def write_genes(genes, path, width=8, height=8):
+    # The moves of path as direction genes (1..8) over the head of genes;
+    # the genes after it are kept
+    neighbors = neighbor_table(width, height)
+    for i in range(len(path) - 1):
+        genes[i] = neighbors[path[i]].index(path[i + 1]) + 1
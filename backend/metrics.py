@@ -0,0 +1,149 @@
+import json
+import sys
+import time
+from collections import Counter
+
+PHASES = ("decode", "local_search", "evaluate", "variation")
+
+
+class Metrics:
+    """Per-generation measurements of a GA run.
+
+    Pass one as genetic_algorithm(..., metrics=Metrics()). Without it the GA
+    runs the plain loop, so measuring costs nothing when it is off. Every
+    generation gets a record with the seconds and net allocated memory
+    blocks of each phase (decode, local_search = the memetic stage, evaluate,
+    variation = selection, crossover and mutation), the number of genes
+    repaired by decoding (moves replaced by another direction), the number
+    rewritten by the memetic stage and the fitness distribution. callback,
+    if given, is called once with each record: after its variation phase,
+    or from finish() for the generation that stopped the run (which has no
+    variation phase).
+    """
+
+    def __init__(self, callback=None):
+        self.callback = callback
+        self.generations = []
+        self.reported = 0    # records passed to the callback
+        self.target = None   # fitness of a solution, for the histogram buckets
+
+    def _phase(self, record, phase, function, *args):
+        blocks = sys.getallocatedblocks()
+        start = time.perf_counter()
+        result = function(*args)
+        record["seconds"][phase] = time.perf_counter() - start
+        record["blocks"][phase] = sys.getallocatedblocks() - blocks
+        return result
+
+    def measure_evaluation(self, population):
+        # check_population (timed as decode and local_search) + evaluate,
+        # returns evaluate()'s result
+        if self.target is None:
+            self.target = population.width * population.height + population.closed
+        record = {"generation": population.generation, "seconds": {}, "blocks": {}}
+        before = _genes(population)
+        self._phase(record, "decode", population.decode)
+        decoded = _genes(population)
+        record["repairs"] = _changed(before, decoded)
+        record["memetic_rewrites"] = 0
+        if population.memetic:
+            self._phase(record, "local_search", population.local_search, population.memetic)
+            record["memetic_rewrites"] = _changed(decoded, _genes(population))
+        best = self._phase(record, "evaluate", population.evaluate)
+        fitness = _fitness(population)
+        record["best_fitness"] = max(fitness)
+        record["mean_fitness"] = sum(fitness) / len(fitness)
+        record["fitness"] = {str(value): count for value, count in sorted(Counter(fitness).items())}
+        self.generations.append(record)
+        return best
+
+    def measure_variation(self, population):
+        record = self.generations[-1]
+        self._phase(record, "variation", population.create_new_generation)
+        self._report()
+
+    def finish(self):
+        # End of the run: report the last record
+        self._report()
+
+    def _report(self):
+        if self.callback is not None:
+            for record in self.generations[self.reported:]:
+                self.callback(record)
+        self.reported = len(self.generations)
+
+    def totals(self):
+        seconds = {phase: sum(r["seconds"].get(phase, 0.0) for r in self.generations)
+                   for phase in PHASES}
+        return {
+            "generations": len(self.generations),
+            "seconds": seconds,
+            "repairs": sum(r["repairs"] for r in self.generations),
+            "memetic_rewrites": sum(r["memetic_rewrites"] for r in self.generations),
+            "best_fitness": max((r["best_fitness"] for r in self.generations), default=0),
+        }
+
+    def to_json(self):
+        return json.dumps({"totals": self.totals(), "generations": self.generations})
+
+    def to_prometheus(self):
+        # Prometheus text exposition format: totals of the run, plus the
+        # last generation's fitness distribution as a histogram
+        totals = self.totals()
+        lines = [
+            "# HELP ga_generations_total Generations evaluated",
+            "# TYPE ga_generations_total counter",
+            f"ga_generations_total {totals['generations']}",
+            "# HELP ga_phase_seconds_total Seconds spent in each GA phase",
+            "# TYPE ga_phase_seconds_total counter",
+        ]
+        for phase in PHASES:
+            lines.append(f'ga_phase_seconds_total{{phase="{phase}"}} {totals["seconds"][phase]:.6f}')
+        lines += [
+            "# HELP ga_repairs_total Genes replaced by another direction while decoding",
+            "# TYPE ga_repairs_total counter",
+            f"ga_repairs_total {totals['repairs']}",
+            "# HELP ga_memetic_rewrites_total Genes rewritten by the memetic local search",
+            "# TYPE ga_memetic_rewrites_total counter",
+            f"ga_memetic_rewrites_total {totals['memetic_rewrites']}",
+            "# HELP ga_best_fitness Best fitness so far",
+            "# TYPE ga_best_fitness gauge",
+            f"ga_best_fitness {totals['best_fitness']}",
+        ]
+        if self.generations:
+            distribution = {int(v): c for v, c in self.generations[-1]["fitness"].items()}
+            bounds = sorted({max(1, self.target * k // 8) for k in range(1, 9)})
+            lines += [
+                "# HELP ga_fitness Fitness of the last generation",
+                "# TYPE ga_fitness histogram",
+            ]
+            for bound in bounds:
+                count = sum(c for v, c in distribution.items() if v <= bound)
+                lines.append(f'ga_fitness_bucket{{le="{bound}"}} {count}')
+            lines += [
+                f'ga_fitness_bucket{{le="+Inf"}} {sum(distribution.values())}',
+                f"ga_fitness_sum {sum(v * c for v, c in distribution.items())}",
+                f"ga_fitness_count {sum(distribution.values())}",
+            ]
+        return "\n".join(lines) + "\n"
+
+
+# Engine specific access: Population has knights, VectorPopulation matrices
+
+def _genes(population):
+    if hasattr(population, "knights"):
+        return [bytes(kn.chromosome.genes) for kn in population.knights]
+    return population.genes.copy()
+
+
+def _changed(before, after):
+    if isinstance(before, list):
+        return sum(a != b for old, new in zip(before, after) if old != new
+                   for a, b in zip(old, new))
+    return int((before != after).sum())
+
+
+def _fitness(population):
+    if hasattr(population, "knights"):
+        return [kn.fitness for kn in population.knights]
+    return population.fitness.tolist()
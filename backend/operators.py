@@ -0,0 +1,132 @@
+import numpy as np
+
+# Population-level variation and selection operators for VectorPopulation.
+# Each crossover takes the two parent gene matrices (row i of genes1 is mated
+# with row i of genes2) and returns the two child matrices, drawing all of its
+# random numbers for the whole generation at once from rng, a numpy Generator.
+
+
+def single_point(genes1, genes2, rng):
+    # Heads up to a point between 1 and length-1 swapped
+    n, length = genes1.shape
+    points = rng.integers(1, length, size=n)
+    head = np.arange(length) < points[:, None]
+    return np.where(head, genes1, genes2), np.where(head, genes2, genes1)
+
+
+def two_point(genes1, genes2, rng):
+    # The segment between two points swapped
+    n, length = genes1.shape
+    points = np.sort(rng.integers(1, length, size=(n, 2)), axis=1)
+    index = np.arange(length)
+    middle = (index >= points[:, :1]) & (index < points[:, 1:])
+    return np.where(middle, genes2, genes1), np.where(middle, genes1, genes2)
+
+
+def uniform(genes1, genes2, rng):
+    # Every gene taken from either parent with probability 1/2
+    take_first = rng.random(genes1.shape) < 0.5
+    return np.where(take_first, genes1, genes2), np.where(take_first, genes2, genes1)
+
+
+def _order_child(segment_parent, fill_parent, start, end):
+    # Order crossover (OX) for gene multisets: keep segment_parent's genes in
+    # [start, end), then fill the other positions, from `end` onwards and
+    # wrapping around, with fill_parent's genes in the order they appear from
+    # `end`, skipping one occurrence of every gene already in the segment.
+    n, length = segment_parent.shape
+    rows = np.arange(n)[:, None]
+    index = np.arange(length)
+    in_segment = (index >= start[:, None]) & (index < end[:, None])
+    rotated = fill_parent[rows, (end[:, None] + index) % length]
+
+    keep = np.ones((n, length), dtype=bool)
+    for gene in range(1, 9):
+        in_fill = rotated == gene
+        used = ((segment_parent == gene) & in_segment).sum(axis=1)
+        keep &= ~in_fill | (np.cumsum(in_fill, axis=1) > used[:, None])
+
+    # Kept genes first, in order; only the first length - segment ones are used
+    fill = rotated[rows, np.argsort(~keep, axis=1, kind="stable")]
+    free = index < (length - (end - start))[:, None]
+    child = segment_parent.copy()
+    positions = (end[:, None] + index) % length
+    child[np.broadcast_to(rows, (n, length))[free], positions[free]] = fill[free]
+    return child
+
+
+def order(genes1, genes2, rng):
+    n, length = genes1.shape
+    points = np.sort(rng.integers(0, length + 1, size=(n, 2)), axis=1)
+    start, end = points[:, 0], points[:, 1]
+    return _order_child(genes1, genes2, start, end), _order_child(genes2, genes1, start, end)
+
+
+CROSSOVERS = {
+    "single_point": single_point,
+    "two_point": two_point,
+    "uniform": uniform,
+    "order": order,
+}
+
+
+def get_crossover(name):
+    if name not in CROSSOVERS:
+        raise ValueError(f"Unknown crossover: {name}")
+    return CROSSOVERS[name]
+
+
+def mutate(genes, mutation_rate, rng):
+    # In place: every gene becomes a random move with probability mutation_rate
+    mask = rng.random(genes.shape) < mutation_rate
+    genes[mask] = rng.integers(1, 9, size=int(mask.sum()), dtype=np.uint8)
+    return genes
+
+
+# Parent selection: the same strategies as backend.selection, over the
+# fitness array. Each returns two index arrays, parents1[i] mates with parents2[i].
+
+def tournament_selection(fitness, count, rng):
+    # count tournaments of 3 (with replacement), returning the two best of each
+    candidates = rng.integers(0, fitness.shape[0], size=(count, 3))
+    order = np.argsort(-fitness[candidates], axis=1, kind="stable")
+    rows = np.arange(count)
+    return candidates[rows, order[:, 0]], candidates[rows, order[:, 1]]
+
+
+def rank_selection(fitness, count, rng):
+    # Linear ranking: the i-th worst individual is drawn with weight i
+    n = fitness.shape[0]
+    order = np.argsort(fitness, kind="stable")
+    weights = np.arange(1, n + 1, dtype=np.float64)
+    drawn = order[rng.choice(n, size=2 * count, p=weights / weights.sum())]
+    return drawn[0::2], drawn[1::2]
+
+
+def sus_selection(fitness, count, rng):
+    # Stochastic universal sampling, then shuffled into pairs
+    cumulative = np.cumsum(fitness, dtype=np.float64)
+    picks = 2 * count
+    step = cumulative[-1] / picks
+    pointers = rng.random() * step + np.arange(picks) * step
+    drawn = np.searchsorted(cumulative, pointers, side="right")
+    rng.shuffle(drawn)
+    return drawn[0::2], drawn[1::2]
+
+
+SELECTIONS = {
+    "tournament": tournament_selection,
+    "rank": rank_selection,
+    "sus": sus_selection,
+}
+
+
+def get_selection(name):
+    if name not in SELECTIONS:
+        raise ValueError(f"Unknown selection: {name}")
+    return SELECTIONS[name]
+
+
+def elite(fitness, k):
+    # Indices of the k fittest, best first
+    return np.argsort(-fitness, kind="stable")[:k]
@@ -0,0 +1,33 @@
+from collections import namedtuple
+
+# One GA generation as reported by iter_generations. best_fitness/best_path
+# are the best so far, mean_fitness is this generation's, elapsed is seconds
+# since the start and stop_reason is None until the last generation.
+GenerationStats = namedtuple(
+    "GenerationStats",
+    ["generation", "best_fitness", "mean_fitness", "best_path", "elapsed", "stop_reason"],
+)
+
+
+class SolveResult(tuple):
+    """(path, execution_time) tuple that also carries how the run ended"""
+
+    def __new__(cls, path, execution_time, generations=0, complete=True, stop_reason="solved"):
+        result = super().__new__(cls, (path, execution_time))
+        result.fitness = len(path)          # squares visited by the path
+        result.generations = generations    # GA generations run (0 for the other solvers)
+        result.complete = complete          # True if the path visits every square
+        result.stop_reason = stop_reason    # "solved", "max_generations", "time_limit", ...
+        return result
+
+    def __getnewargs__(self):
+        # Rebuild with all fields when pickled back from a worker process
+        return (self[0], self[1], self.generations, self.complete, self.stop_reason)
+
+    @property
+    def path(self):
+        return self[0]
+
+    @property
+    def execution_time(self):
+        return self[1]
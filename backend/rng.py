@@ -0,0 +1,98 @@
+import hashlib
+import random
+
+
+def seed_all(seed):
+    # Seed the global generators used by the GA (random, and numpy if present)
+    random.seed(seed)
+    try:
+        import numpy as np
+    except ImportError:
+        return
+    np.random.seed(seed)
+
+
+class RNG(random.Random):
+    """Seedable random stream for the GA, with independent child streams.
+
+    A stream is identified by its seed (entropy) and spawn key, like a
+    numpy SeedSequence: spawn(n) gives n children whose streams depend only
+    on (entropy, spawn key), never on how much the parent was used, so the
+    same seed gives the same streams whatever the number of workers.
+    Besides the random.Random methods it has the numpy Generator names used
+    by the GA (integers, random, choice, shuffle, spawn), and numpy() gives
+    the matching numpy Generator for the vectorized engine.
+    """
+
+    def __init__(self, entropy=None, spawn_key=()):
+        if entropy is None:
+            entropy = random.SystemRandom().getrandbits(64)
+        self.entropy = entropy
+        self.spawn_key = tuple(spawn_key)
+        self.children = 0  # streams spawned so far
+        digest = hashlib.sha256(repr((entropy, self.spawn_key)).encode()).digest()
+        super().__init__(int.from_bytes(digest, "big"))
+
+    def __reduce__(self):
+        # random.Random would pickle the state only, losing entropy/spawn_key
+        return _restore, (self.entropy, self.spawn_key, self.children, self.getstate())
+
+    def integers(self, low, high=None):
+        # Like Generator.integers: low <= n < high, or 0 <= n < low
+        if high is None:
+            return self.randrange(low)
+        return self.randrange(low, high)
+
+    def spawn(self, n):
+        first = self.children
+        self.children += n
+        return [RNG(self.entropy, self.spawn_key + (i,)) for i in range(first, first + n)]
+
+    def numpy(self):
+        import numpy as np
+        return np.random.default_rng(np.random.SeedSequence(self.entropy, spawn_key=self.spawn_key))
+
+
+def _restore(entropy, spawn_key, children, state):
+    rng = RNG(entropy, spawn_key)
+    rng.children = children
+    rng.setstate(state)
+    return rng
+
+
+def make_rng(rng=None):
+    # An RNG from a seed (int), an RNG (returned as is) or None: then the seed
+    # is drawn from the global random module, so seed_all still applies
+    if isinstance(rng, RNG):
+        return rng
+    if rng is None:
+        rng = random.getrandbits(64)
+    return RNG(rng)
+
+
+def numpy_rng(rng=None):
+    # A numpy Generator from a seed, an RNG, None (as make_rng) or a Generator
+    if hasattr(rng, "bit_generator"):
+        return rng
+    return make_rng(rng).numpy()
+
+
+def rng_state(rng):
+    # JSON-serializable state of an RNG or numpy Generator (for checkpoints)
+    if isinstance(rng, RNG):
+        version, internal, gauss_next = rng.getstate()
+        return {"type": "python", "entropy": rng.entropy, "spawn_key": list(rng.spawn_key),
+                "children": rng.children, "state": [version, list(internal), gauss_next]}
+    return {"type": "numpy", "state": rng.bit_generator.state}
+
+
+def rng_from_state(data):
+    # Inverse of rng_state
+    if data["type"] == "python":
+        version, internal, gauss_next = data["state"]
+        return _restore(data["entropy"], data["spawn_key"], data["children"],
+                        (version, tuple(internal), gauss_next))
+    import numpy as np
+    bit_generator = getattr(np.random, data["state"]["bit_generator"])()
+    bit_generator.state = data["state"]
+    return np.random.Generator(bit_generator)
@@ -0,0 +1,71 @@
+import heapq
+import random
+from bisect import bisect_right
+from itertools import accumulate
+
+# Parent selection for Population. Every strategy takes the generation's
+# fitness list (computed once, indexed like the knights) and the number of
+# pairs, and returns two lists of knight indices: parents1[i] mates with
+# parents2[i]. rng is a backend.rng.RNG or the random module. The NumPy
+# versions for VectorPopulation are in backend.operators.
+
+
+def tournament(fitness, count, rng=random):
+    # Tournaments of 3 (with replacement), the two best of each become parents.
+    # Ties keep the draw order.
+    choices = rng.choices
+    indices = range(len(fitness))
+    parents1 = []
+    parents2 = []
+    for _ in range(count):
+        a, b, c = choices(indices, k=3)
+        fa, fb = fitness[a], fitness[b]
+        if fb > fa:
+            a, b, fa, fb = b, a, fb, fa
+        fc = fitness[c]
+        if fc > fb:
+            if fc > fa:
+                a, b = c, a
+            else:
+                b = c
+        parents1.append(a)
+        parents2.append(b)
+    return parents1, parents2
+
+
+def rank(fitness, count, rng=random):
+    # Linear ranking: the i-th worst knight is drawn with weight i
+    order = sorted(range(len(fitness)), key=fitness.__getitem__)
+    drawn = rng.choices(order, cum_weights=list(accumulate(range(1, len(order) + 1))),
+                        k=2 * count)
+    return drawn[0::2], drawn[1::2]
+
+
+def sus(fitness, count, rng=random):
+    # Stochastic universal sampling: 2 * count evenly spaced pointers over the
+    # cumulative fitness, one random offset, then shuffled into pairs
+    cumulative = list(accumulate(fitness))
+    picks = 2 * count
+    step = cumulative[-1] / picks
+    offset = rng.random() * step
+    drawn = [bisect_right(cumulative, offset + i * step) for i in range(picks)]
+    rng.shuffle(drawn)
+    return drawn[0::2], drawn[1::2]
+
+
+SELECTIONS = {
+    "tournament": tournament,
+    "rank": rank,
+    "sus": sus,
+}
+
+
+def get_selection(name):
+    if name not in SELECTIONS:
+        raise ValueError(f"Unknown selection: {name}")
+    return SELECTIONS[name]
+
+
+def elite(fitness, k):
+    # Indices of the k fittest, best first
+    return heapq.nlargest(k, range(len(fitness)), key=fitness.__getitem__)
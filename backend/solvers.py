@@ -0,0 +1,128 @@
+import time
+from backend.algorithmes import genetic_algorithm, stream_generations
+from backend.board import coordinates, neighbor_table, square
+from backend.heuristics import backtracking_tour, warnsdorff_tour
+from backend.results import GenerationStats, SolveResult
+from backend.structured import structured_tour
+
+
+class Solver:
+    """Common interface: solve() returns a SolveResult, i.e. (path, execution_time)"""
+
+    name = None
+
+    def solve(self):
+        raise NotImplementedError
+
+    def stream(self, queue):
+        # Put progress (GenerationStats) on queue; the last item has
+        # stop_reason set. Solvers without generations report only the end.
+        result = self.solve()
+        queue.put(GenerationStats(result.generations, result.fitness, float(result.fitness),
+                                  result.path, result.execution_time, result.stop_reason))
+
+
+class GeneticSolver(Solver):
+    name = "genetic"
+
+    def __init__(self, population_size=50, **options):
+        # options are passed on to genetic_algorithm (engine, islands, budgets,
+        # cancel, ...)
+        self.population_size = population_size
+        self.options = options
+
+    def solve(self):
+        return genetic_algorithm(self.population_size, **self.options)
+
+    def stream(self, queue):
+        # One GenerationStats per generation (islands only report the end)
+        if self.options.get("islands", 1) > 1:
+            return super().stream(queue)
+        island_options = ("islands", "migration_interval", "migration_size", "workers")
+        options = {k: v for k, v in self.options.items() if k not in island_options}
+        stream_generations(queue, self.population_size, **options)
+
+
+class WarnsdorffSolver(Solver):
+    name = "warnsdorff"
+
+    def __init__(self, attempts=100, width=8, height=8, cancel=None, start=(0, 0),
+                 closed=False):
+        # closed=True keeps trying until a tour ends a knight move from start
+        self.attempts = attempts
+        self.width = width
+        self.height = height
+        self.cancel = cancel
+        self.start = start
+        self.closed = closed
+
+    def solve(self):
+        # First attempt breaks ties deterministically, the retries randomly
+        start_time = time.time()
+        start = square(*self.start, self.width)
+        squares = self.width * self.height
+        ends = neighbor_table(self.width, self.height)[start]
+        best = []
+        complete = False
+        for attempt in range(self.attempts):
+            if self.cancel is not None and self.cancel.is_set():
+                break
+            tour = warnsdorff_tour(start, randomize=attempt > 0,
+                                   width=self.width, height=self.height)
+            if len(tour) > len(best):
+                best = tour
+            if len(tour) == squares and (not self.closed or tour[-1] in ends):
+                best = tour
+                complete = True
+                break
+        execution_time = time.time() - start_time
+        return SolveResult([coordinates(sq, self.width) for sq in best], execution_time,
+                           complete=complete, stop_reason="solved" if complete else "max_attempts")
+
+
+class BacktrackingSolver(Solver):
+    name = "backtracking"
+
+    def __init__(self, width=8, height=8, cancel=None, start=(0, 0), closed=False):
+        self.width = width
+        self.height = height
+        self.cancel = cancel
+        self.start = start
+        self.closed = closed
+
+    def solve(self):
+        start_time = time.time()
+        tour = backtracking_tour(square(*self.start, self.width), self.width, self.height,
+                                 self.cancel, self.closed)
+        execution_time = time.time() - start_time
+        if tour is None:
+            stop_reason = "cancelled" if self.cancel is not None and self.cancel.is_set() else "no_tour"
+            return SolveResult([], execution_time, complete=False, stop_reason=stop_reason)
+        return SolveResult([coordinates(sq, self.width) for sq in tour], execution_time)
+
+
+class StructuredSolver(Solver):
+    name = "structured"
+
+    def __init__(self, width=8, height=8, cancel=None, start=(0, 0), closed=True):
+        # Always a closed tour, stitched from block tours (backend.structured);
+        # needs an even width and height of at least 6
+        self.width = width
+        self.height = height
+        self.start = start
+
+    def solve(self):
+        start_time = time.time()
+        tour = structured_tour(self.width, self.height, square(*self.start, self.width))
+        execution_time = time.time() - start_time
+        return SolveResult([coordinates(sq, self.width) for sq in tour], execution_time)
+
+
+SOLVERS = {cls.name: cls for cls in (GeneticSolver, WarnsdorffSolver, BacktrackingSolver,
+                                     StructuredSolver)}
+
+
+def get_solver(name, **options):
+    if name not in SOLVERS:
+        raise ValueError(f"Unknown solver: {name}")
+    return SOLVERS[name](**options)
@@ -0,0 +1,99 @@
+"""Closed knight's tours of big boards in linear time, by divide and conquer.
+
+The board (both sides even, at least 6) is cut into blocks 6, 8 or 10
+squares wide and high. Every block gets a copy of a closed tour of its shape,
+found once by backtracking and cached. The block cycles are then merged one
+at a time into a single cycle: next to the border with a block already
+merged, a cycle edge (a1, a2) on one side and (b1, b2) on the other with
+a1-b1 and a2-b2 knight moves are swapped for those two moves. Each merge
+only looks at a constant number of squares, so the whole tour costs
+O(width * height).
+"""
+from functools import lru_cache
+
+from backend.board import is_tour, neighbor_table, square
+from backend.heuristics import backtracking_tour
+
+BLOCK_SIZES = (6, 8, 10)
+
+
+def _split(n):
+    # Block sizes (6, 8 or 10) adding up to n, n even and at least 6
+    count, rest = divmod(n, 8)
+    if rest == 0:
+        return [8] * count
+    if rest == 6:
+        return [8] * count + [6]
+    if rest == 2:
+        return [8] * (count - 1) + [10]
+    return [8] * (count - 1) + [6, 6]
+
+
+@lru_cache(maxsize=None)
+def _block_cycle(width, height):
+    # Closed tour of a width x height block as (square, next square) pairs
+    tour = backtracking_tour(0, width, height, closed=True)
+    return tuple(zip(tour, tour[1:] + tour[:1]))
+
+
+def structured_tour(width, height, start=0):
+    # Closed tour of the width x height board as a list of squares from start
+    if width % 2 or height % 2 or width < 6 or height < 6:
+        raise ValueError("structured tours need an even width and height of at least 6")
+    neighbors = neighbor_table(width, height)
+    squares = width * height
+    # The cycle as an undirected graph: the two tour neighbours of every square
+    link0 = [-1] * squares
+    link1 = [-1] * squares
+    merged = bytearray(squares)
+
+    row = 0
+    for block_height in _split(height):
+        col = 0
+        for block_width in _split(width):
+            block = []
+            for a, b in _block_cycle(block_width, block_height):
+                a = square(row + a // block_width, col + a % block_width, width)
+                b = square(row + b // block_width, col + b % block_width, width)
+                link1[a] = b
+                link0[b] = a
+                block.append(a)
+            if row or col:
+                _merge(block, merged, link0, link1, neighbors)
+            for sq in block:
+                merged[sq] = 1
+            col += block_width
+        row += block_height
+
+    tour = [start]
+    previous, current = start, link0[start]
+    while current != start:
+        tour.append(current)
+        previous, current = current, link1[current] if link0[current] == previous else link0[current]
+    if not is_tour(tour, width, height, closed=True):
+        raise RuntimeError(f"stitching the {width}x{height} tour failed")
+    return tour
+
+
+def _merge(block, merged, link0, link1, neighbors):
+    # Join the block's cycle to the merged cycle by swapping two edges
+    for b1 in block:
+        for a1 in neighbors[b1]:
+            if a1 < 0 or not merged[a1]:
+                continue
+            for b2 in (link0[b1], link1[b1]):
+                for a2 in (link0[a1], link1[a1]):
+                    if b2 in neighbors[a2]:
+                        _replace(link0, link1, a1, a2, b1)
+                        _replace(link0, link1, a2, a1, b2)
+                        _replace(link0, link1, b1, b2, a1)
+                        _replace(link0, link1, b2, b1, a2)
+                        return
+    raise RuntimeError("no edges to merge the blocks")
+
+
+def _replace(link0, link1, sq, old, new):
+    if link0[sq] == old:
+        link0[sq] = new
+    else:
+        link1[sq] = new
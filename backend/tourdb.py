@@ -0,0 +1,272 @@
+"""Database of distinct complete knight's tours of one board.
+
+    python -m backend.tourdb collect tours8 --board 8 --all-starts --runs 4 --memetic 5
+    python -m backend.tourdb query tours8 --start 0,0 --end 1,2 --closed
+
+<directory>/tours.bin holds the tours back to back. Every square is packed in
+ceil(log2(width * height)) bits, so an 8x8 tour is 48 bytes.
+<directory>/index.json records the board and, per (start, end, closed) key,
+the record numbers of its tours. The key index is loaded into a dict, so a
+query by start and end is one or two lookups (closed, open or both), and a
+query by start alone goes through that start's keys only. Tours are
+deduplicated by a hash of their packed bytes.
+"""
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import hashlib
+import json
+import os
+import sys
+import tempfile
+
+from backend.Population import Population
+from backend.board import coordinates, is_tour, neighbor_table, parse_board, parse_start, square
+from backend.rng import make_rng
+
+
+def _digest(packed):
+    return hashlib.blake2b(packed, digest_size=16).digest()
+
+
+class TourDB:
+    """Append-only store of complete tours of a width x height board"""
+
+    def __init__(self, directory, width=None, height=None):
+        # The board of an existing database is read from its index; width
+        # and height, if given, must match it. A new one defaults to 8x8.
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.index_file = os.path.join(directory, "index.json")
+        data_file = os.path.join(directory, "tours.bin")
+        self.index = {}    # (start, end, closed) -> record numbers
+        self.starts = {}   # start -> its keys in index
+        self.count = 0     # records in the index
+        if width is not None and height is None:
+            height = width
+        if os.path.exists(self.index_file):
+            with open(self.index_file) as f:
+                header = json.load(f)
+            if (width, height) not in ((None, None), (header["width"], header["height"])):
+                raise ValueError(f"{directory} holds tours of a "
+                                 f"{header['width']}x{header['height']} board")
+            width, height = header["width"], header["height"]
+            self.count = header["count"]
+            for key, records in header["index"].items():
+                start, end, closed = key.split(",")
+                key = int(start), int(end), closed == "1"
+                self.index[key] = records
+                self.starts.setdefault(key[0], []).append(key)
+        self.saved = self.count
+        self.width = width or 8
+        self.height = height or self.width
+        self.squares = self.width * self.height
+        self.bits = max(1, (self.squares - 1).bit_length())
+        self.record_size = (self.squares * self.bits + 7) // 8
+        if not os.path.exists(data_file):
+            open(data_file, "wb").close()
+        self.data = open(data_file, "r+b")
+        # A crash in the middle of an append leaves a partial record at the
+        # end: cut it off, so the next tour is written at its own offset
+        records = os.path.getsize(data_file) // self.record_size
+        self.data.truncate(records * self.record_size)
+
+        # Hashes of the stored tours, and index entries for any record
+        # appended after the index was last saved
+        self.hashes = set()
+        self.data.seek(0)
+        for record in range(records):
+            packed = self.data.read(self.record_size)
+            self.hashes.add(_digest(packed))
+            if record >= self.count:
+                self._index(self.unpack(packed), record)
+        self.count = records
+
+    def __len__(self):
+        return self.count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def pack(self, path):
+        value = 0
+        for i, sq in enumerate(path):
+            value |= sq << (i * self.bits)
+        return value.to_bytes(self.record_size, "little")
+
+    def unpack(self, packed):
+        value = int.from_bytes(packed, "little")
+        mask = (1 << self.bits) - 1
+        return [(value >> (i * self.bits)) & mask for i in range(self.squares)]
+
+    def _index(self, path, record):
+        closed = path[0] in neighbor_table(self.width, self.height)[path[-1]]
+        key = path[0], path[-1], closed
+        if key not in self.index:
+            self.index[key] = []
+            self.starts.setdefault(path[0], []).append(key)
+        self.index[key].append(record)
+
+    def add(self, path):
+        # path: squares of a complete tour. Returns False if already stored
+        if not is_tour(path, self.width, self.height):
+            raise ValueError("not a complete knight's tour of this board")
+        packed = self.pack(path)
+        digest = _digest(packed)
+        if digest in self.hashes:
+            return False
+        self.hashes.add(digest)
+        self.data.seek(self.count * self.record_size)
+        self.data.write(packed)
+        self._index(path, self.count)
+        self.count += 1
+        return True
+
+    def lookup(self, start, end=None, closed=None):
+        # Record numbers of the tours from start (and to end, closed or not:
+        # None matches any)
+        if end is not None:
+            found = []
+            for c in ((True, False) if closed is None else (closed,)):
+                found += self.index.get((start, end, c), ())
+            return found
+        return [record for key in self.starts.get(start, ())
+                if closed in (None, key[2]) for record in self.index[key]]
+
+    def read(self, record):
+        self.data.seek(record * self.record_size)
+        return self.unpack(self.data.read(self.record_size))
+
+    def tours(self, start, end=None, closed=None):
+        return [self.read(record) for record in self.lookup(start, end, closed)]
+
+    def save(self):
+        # Tours first, then the index (write then rename, as checkpoints)
+        self.data.flush()
+        os.fsync(self.data.fileno())
+        header = {
+            "width": self.width, "height": self.height, "bits": self.bits,
+            "count": self.count,
+            "index": {f"{s},{e},{int(c)}": records for (s, e, c), records in self.index.items()},
+        }
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(header, f)
+        os.replace(tmp, self.index_file)
+        self.saved = self.count
+
+    def close(self):
+        if self.count != self.saved or not os.path.exists(self.index_file):
+            self.save()
+        self.data.close()
+
+
+def collect_run(engine, population_size, generations, rng, options):
+    # One GA run kept going for `generations` generations (it doesn't stop at
+    # the first full tour); returns every distinct full tour it decoded
+    if engine == "vectorized":
+        from backend.VectorPopulation import VectorPopulation
+        population = VectorPopulation(population_size, rng=rng, **options)
+    else:
+        population = Population(population_size, rng=rng, **options)
+    tours = set()
+    for _ in range(generations):
+        population.check_population()
+        tours.update(map(tuple, population.complete_paths()))
+        population.create_new_generation()
+    return [list(tour) for tour in tours]
+
+
+def collect_tours(db, starts, runs=1, generations=100, population_size=50, engine="knight",
+                  workers=None, rng=None, **population_options):
+    # Run `runs` GAs per start square ((row, col) tuples) over a process
+    # pool and add their full tours to db. Every run draws from its own
+    # stream spawned from rng. population_options (memetic, closed, ...) go
+    # to the populations. Returns the number of new tours.
+    jobs = [start for start in starts for _ in range(runs)]
+    streams = make_rng(rng).spawn(len(jobs))
+    if engine == "vectorized":
+        streams = [stream.numpy() for stream in streams]
+    added = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(collect_run, engine, population_size, generations, stream,
+                        dict(population_options, width=db.width, height=db.height, start=start))
+            for start, stream in zip(jobs, streams)
+        ]
+        for future in as_completed(futures):
+            added += sum(db.add(tour) for tour in future.result())
+            db.save()
+    return added
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m backend.tourdb",
+                                     description="Collect and query distinct knight's tours")
+    commands = parser.add_subparsers(dest="command", required=True)
+    collect = commands.add_parser("collect", help="run GAs and store the tours they find")
+    collect.add_argument("directory")
+    collect.add_argument("--board", default="8", help="N or WxH, default 8")
+    collect.add_argument("--start", action="append", default=[],
+                         help="starting square as row,col (repeatable, default 0,0)")
+    collect.add_argument("--all-starts", action="store_true", help="every square as a start")
+    collect.add_argument("--runs", type=int, default=1, help="GA runs per start, default 1")
+    collect.add_argument("--generations", type=int, default=100,
+                         help="generations per run, default 100")
+    collect.add_argument("--population-size", type=int, default=50)
+    collect.add_argument("--engine", choices=["knight", "vectorized"], default="knight")
+    collect.add_argument("--memetic", type=int, default=0,
+                         help="fittest tours improved by local search each generation")
+    collect.add_argument("--closed", action="store_true", help="reward closed tours")
+    collect.add_argument("--workers", type=int, help="worker processes (default: CPU count)")
+    collect.add_argument("--seed", type=int, help="random seed for a reproducible collection")
+    query = commands.add_parser("query", help="print stored tours as JSON lines")
+    query.add_argument("directory")
+    query.add_argument("--start", default="0,0", help="starting square as row,col")
+    query.add_argument("--end", help="last square as row,col (default: any)")
+    closedness = query.add_mutually_exclusive_group()
+    closedness.add_argument("--closed", action="store_true", help="only closed tours")
+    closedness.add_argument("--open", action="store_true", help="only open tours")
+    query.add_argument("--count", action="store_true", help="print the number of tours only")
+    args = parser.parse_args(argv)
+
+    if args.command == "collect":
+        width, height = parse_board(args.board)
+        try:
+            starts = [parse_start(s, width, height) for s in args.start or ["0,0"]]
+        except ValueError as e:
+            parser.error(str(e))
+        with TourDB(args.directory, width, height) as db:
+            if args.all_starts:
+                starts = [coordinates(sq, db.width) for sq in range(db.squares)]
+            added = collect_tours(db, starts, args.runs, args.generations, args.population_size,
+                                  args.engine, args.workers, args.seed,
+                                  memetic=args.memetic, closed=args.closed)
+            print(f"{added} new tours, {len(db)} in {args.directory}")
+        return 0
+
+    if not os.path.exists(os.path.join(args.directory, "index.json")):
+        print(f"No tour database in {args.directory}", file=sys.stderr)
+        return 1
+    with TourDB(args.directory) as db:
+        try:
+            start = square(*parse_start(args.start, db.width, db.height), db.width)
+            end = None
+            if args.end:
+                end = square(*parse_start(args.end, db.width, db.height), db.width)
+        except ValueError as e:
+            parser.error(str(e))
+        closed = True if args.closed else False if args.open else None
+        records = db.lookup(start, end, closed)
+        if args.count:
+            print(len(records))
+        else:
+            for record in records:
+                print(json.dumps([list(coordinates(sq, db.width)) for sq in db.read(record)]))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
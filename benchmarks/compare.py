@@ -0,0 +1,58 @@
+"""Compare two benchmark JSON files from benchmarks.run.
+
+    python -m benchmarks.compare old.json new.json --threshold 0.1
+
+Exits with status 1 if any timing got slower by more than the threshold.
+"""
+import argparse
+import json
+import sys
+
+
+def timing(entry):
+    # Best-of-repeats for micro-benchmarks (least noisy), wall time for solves
+    return entry.get("min", entry.get("seconds"))
+
+
+def compare(old, new, threshold):
+    regressions = []
+    rows = []
+    for name in sorted(set(old) & set(new)):
+        before, after = timing(old[name]), timing(new[name])
+        if not before:
+            continue
+        ratio = after / before
+        flag = ""
+        # Full solves depend on luck as much as speed, only flag timings
+        if ratio > 1 + threshold and "min" in new[name]:
+            flag = "REGRESSION"
+            regressions.append(name)
+        rows.append((name, before, after, ratio, flag))
+    return rows, regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Diff two benchmark result files")
+    parser.add_argument("old")
+    parser.add_argument("new")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="allowed slowdown, default 0.1 (10%%)")
+    args = parser.parse_args(argv)
+
+    with open(args.old) as f:
+        old = json.load(f)
+    with open(args.new) as f:
+        new = json.load(f)
+    if old["meta"]["seed"] != new["meta"]["seed"]:
+        print("warning: results were produced with different seeds")
+
+    rows, regressions = compare(old["results"], new["results"], args.threshold)
+    for name, before, after, ratio, flag in rows:
+        print(f"{name:60} {before * 1e3:10.3f}ms {after * 1e3:10.3f}ms {ratio:6.2f}x {flag}")
+    for name in sorted(set(old["results"]) ^ set(new["results"])):
+        print(f"{name:60} only in {'old' if name in old['results'] else 'new'}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,202 @@
+"""Benchmarks for the GA hot paths, written as JSON for comparing commits.
+
+    python -m benchmarks.run --seed 1 --output bench.json
+    python -m benchmarks.compare old.json new.json
+"""
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+from backend.Chromosome import Chromosome
+from backend.Knight import Knight
+from backend.Population import Population
+from backend.algorithmes import genetic_algorithm
+from backend.board import parse_board
+from backend.rng import seed_all
+from backend.solvers import get_solver
+
+try:
+    import numpy as np
+    from backend.VectorPopulation import VectorPopulation
+except ImportError:  # the vectorized engine is optional
+    np = None
+
+
+def measure(fn, repeat, number, setup=None):
+    # Seconds per call of fn(arg), arg = setup() run outside the timing
+    times = []
+    for _ in range(repeat):
+        args = [setup() for _ in range(number)] if setup else [None] * number
+        start = time.perf_counter()
+        for arg in args:
+            fn(arg)
+        times.append((time.perf_counter() - start) / number)
+    return {"min": min(times), "median": statistics.median(times),
+            "repeat": repeat, "number": number}
+
+
+def board_label(width, height):
+    return f"{width}x{height}"
+
+
+def bench_knight(seed, width, height, repeat):
+    results = {}
+    label = board_label(width, height)
+    seed_all(seed)
+    genes = [Chromosome.randomGene(width * height - 1) for _ in range(50)]
+
+    def decode(_):
+        for g in genes:
+            Knight(Chromosome(list(g)), width, height).check_moves()
+    results[f"knight.check_moves[{label}]"] = measure(decode, repeat, 10)
+
+    knights = [Knight(Chromosome(list(g)), width, height) for g in genes]
+    for kn in knights:
+        kn.check_moves()
+
+    def evaluate(_):
+        for kn in knights:
+            kn.evaluate_fitness()
+    results[f"knight.evaluate_fitness[{label}]"] = measure(evaluate, repeat, 10)
+    return results
+
+
+def bench_chromosome(seed, width, height, repeat):
+    results = {}
+    label = board_label(width, height)
+    seed_all(seed)
+    pairs = [(Chromosome(length=width * height - 1), Chromosome(length=width * height - 1))
+             for _ in range(50)]
+
+    def crossover(_):
+        for a, b in pairs:
+            a.crossover(b)
+    results[f"chromosome.crossover[{label}]"] = measure(crossover, repeat, 10)
+
+    def mutation(_):
+        for a, _b in pairs:
+            a.mutation()
+    results[f"chromosome.mutation[{label}]"] = measure(mutation, repeat, 10)
+    return results
+
+
+def bench_population(seed, size, width, height, repeat):
+    results = {}
+    label = f"{size},{board_label(width, height)}"
+    seed_all(seed)
+
+    def decoded():
+        population = Population(size, width=width, height=height)
+        population.check_population()
+        population.evaluate()
+        return population
+    results[f"population.check_population[{label}]"] = measure(
+        lambda p: p.check_population(), repeat, 3,
+        setup=lambda: Population(size, width=width, height=height))
+    results[f"population.create_new_generation[{label}]"] = measure(
+        lambda p: p.create_new_generation(), repeat, 3, setup=decoded)
+
+    def warmed():
+        # Two generations in, so children reuse the spare knights (the
+        # steady state of a run) instead of allocating them
+        population = decoded()
+        for _ in range(2):
+            population.create_new_generation()
+            population.check_population()
+            population.evaluate()
+        return population
+    results[f"population.create_new_generation.steady[{label}]"] = measure(
+        lambda p: p.create_new_generation(), repeat, 3, setup=warmed)
+
+    if np is not None:
+        def vector_decoded():
+            population = VectorPopulation(size, width=width, height=height)
+            population.check_population()
+            return population
+        results[f"vectorized.check_population[{label}]"] = measure(
+            lambda p: p.check_population(), repeat, 3,
+            setup=lambda: VectorPopulation(size, width=width, height=height))
+        results[f"vectorized.create_new_generation[{label}]"] = measure(
+            lambda p: p.create_new_generation(), repeat, 3, setup=vector_decoded)
+    return results
+
+
+def bench_solves(seed, size, width, height, max_generations):
+    # One run per solver; wall time plus how far the GA got
+    results = {}
+    label = f"{size},{board_label(width, height)}"
+    engines = ["knight"] + (["vectorized"] if np is not None else [])
+    for engine in engines:
+        seed_all(seed)
+        result = genetic_algorithm(size, engine=engine, width=width, height=height,
+                                   max_generations=max_generations)
+        results[f"solve.genetic.{engine}[{label}]"] = {
+            "seconds": result.execution_time, "generations": result.generations,
+            "fitness": result.fitness, "complete": result.complete,
+        }
+    for name in ("warnsdorff", "backtracking"):
+        seed_all(seed)
+        result = get_solver(name, width=width, height=height).solve()
+        results[f"solve.{name}[{board_label(width, height)}]"] = {
+            "seconds": result.execution_time, "fitness": result.fitness,
+            "complete": result.complete,
+        }
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], text=True,
+                                       stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the knight's tour GA hot paths")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--population-sizes", default="50,500",
+                        help="comma separated, default 50,500")
+    parser.add_argument("--board-sizes", default="8,10",
+                        help="comma separated, N or WxH, default 8,10")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--max-generations", type=int, default=200,
+                        help="generation budget of each full GA solve")
+    parser.add_argument("--output", help="JSON file (default: stdout)")
+    args = parser.parse_args(argv)
+
+    sizes = [int(s) for s in args.population_sizes.split(",")]
+    boards = [parse_board(b) for b in args.board_sizes.split(",")]
+
+    results = {}
+    for width, height in boards:
+        results.update(bench_knight(args.seed, width, height, args.repeat))
+        results.update(bench_chromosome(args.seed, width, height, args.repeat))
+        for size in sizes:
+            results.update(bench_population(args.seed, size, width, height, args.repeat))
+            results.update(bench_solves(args.seed, size, width, height, args.max_generations))
+
+    report = {
+        "meta": {
+            "seed": args.seed,
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "numpy": np.__version__ if np is not None else None,
+        },
+        "results": results,
+    }
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
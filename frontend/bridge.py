@@ -0,0 +1,62 @@
+import asyncio
+import threading
+
+import pygame
+
+from backend.asyncsolve import AsyncSolver
+
+# Posted on the pygame event queue: SOLVER_PROGRESS has .stats (a
+# GenerationStats), SOLVER_DONE has .result (a SolveResult) and .error
+# (the exception that stopped the solver, or None)
+SOLVER_PROGRESS = pygame.event.custom_type()
+SOLVER_DONE = pygame.event.custom_type()
+
+
+class SolverBridge:
+    """Runs backend.asyncsolve solves on an asyncio loop in a background
+    thread and posts their progress and results as pygame events, so the
+    GUI only reads its event queue. Several solves can be in flight."""
+
+    def __init__(self, workers=None):
+        self.workers = workers
+        self.solver = None    # AsyncSolver, started with the first solve
+        self.tasks = set()
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+
+    def start(self, solver="genetic", tag=None, **options):
+        # tag is copied to the events of this solve, to tell solves apart
+        asyncio.run_coroutine_threadsafe(self._solve(solver, tag, options), self.loop)
+
+    async def _solve(self, solver, tag, options):
+        if self.solver is None:
+            self.solver = AsyncSolver(self.workers)
+        self.tasks.add(asyncio.current_task())
+        try:
+            result = await self.solver.solve(
+                solver, lambda stats: self._post(SOLVER_PROGRESS, tag, stats=stats), **options)
+        except Exception as e:
+            self._post(SOLVER_DONE, tag, result=None, error=e)
+        else:
+            self._post(SOLVER_DONE, tag, result=result, error=None)
+        finally:
+            self.tasks.discard(asyncio.current_task())
+
+    def _post(self, event_type, tag, **attributes):
+        # pygame.event.post is safe to call from other threads
+        if pygame.get_init():
+            pygame.event.post(pygame.event.Event(event_type, tag=tag, **attributes))
+
+    def close(self, timeout=5):
+        # Cancel the solves in flight, stop the workers and the loop thread
+        asyncio.run_coroutine_threadsafe(self._close(), self.loop).result(timeout)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(timeout)
+
+    async def _close(self):
+        for task in list(self.tasks):
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        if self.solver is not None:
+            self.solver.close()
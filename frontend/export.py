@@ -0,0 +1,128 @@
+"""Render tours offscreen to PNG frames or sprite sheets, no window needed.
+
+    python -m frontend.export result.json --out frames
+    python -m frontend.export results.jsonl --out sheets --sprite-sheet --every 4
+
+The input is the JSON written by `python -m backend --format json`, the JSON
+lines printed by `python -m backend.batch`, or a JSON list of either. Every
+tour is drawn with ChessBoard as fast as possible (SDL dummy video driver),
+into <out>/tour_0001/frame_0000.png, ... or one <out>/tour_0001.png sheet.
+"""
+import argparse
+import json
+import os
+import sys
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+import pygame
+
+from frontend.main import BLACK, ChessBoard
+
+
+def init():
+    # Images need a display mode to be converted, a 1x1 one is enough
+    if not pygame.get_init():
+        pygame.init()
+    if pygame.display.get_surface() is None:
+        pygame.display.set_mode((1, 1))
+
+
+def render_frames(path, width, height, cell_size=40, every=1):
+    # Yield (step, surface) after every `every` steps of path, and after the
+    # last one. The same surface is updated in place: only the squares that
+    # changed since the previous frame are redrawn.
+    init()
+    path = [tuple(position) for position in path]
+    board = ChessBoard(0, 0, cell_size, width, height)
+    surface = pygame.Surface((width * cell_size, height * cell_size))
+    surface.fill(BLACK)
+    if not path:
+        board.draw(surface, path, 0)
+        yield 0, surface
+        return
+    board.update_position(path, 0)
+    board.draw(surface, path, 0)
+    drawn = 0
+    for step in range(len(path)):
+        if step % every and step != len(path) - 1:
+            continue
+        board.update_position(path, step)
+        for position in path[drawn:step + 1]:
+            board.draw_cell(surface, position, path, step)
+        drawn = step
+        yield step, surface
+
+
+def export_frames(path, width, height, directory, cell_size=40, every=1):
+    # One PNG per frame, returns the file names
+    os.makedirs(directory, exist_ok=True)
+    files = []
+    for step, surface in render_frames(path, width, height, cell_size, every):
+        filename = os.path.join(directory, f"frame_{step:04d}.png")
+        pygame.image.save(surface, filename)
+        files.append(filename)
+    return files
+
+
+def export_sprite_sheet(path, width, height, filename, cell_size=40, every=1, columns=8):
+    # Every frame on one PNG, `columns` frames per row, left to right
+    last = len(path) - 1
+    frame_count = max(1, sum(1 for step in range(len(path)) if step % every == 0 or step == last))
+    rows = (frame_count + columns - 1) // columns
+    frame_width, frame_height = width * cell_size, height * cell_size
+    init()
+    sheet = pygame.Surface((min(frame_count, columns) * frame_width, rows * frame_height))
+    sheet.fill(BLACK)
+    for i, (_step, surface) in enumerate(render_frames(path, width, height, cell_size, every)):
+        sheet.blit(surface, ((i % columns) * frame_width, (i // columns) * frame_height))
+    pygame.image.save(sheet, filename)
+    return filename
+
+
+def load_results(filename):
+    # (path, width, height) of every tour in a results file ('-' for stdin)
+    if filename == "-":
+        text = sys.stdin.read()
+    else:
+        with open(filename) as f:
+            text = f.read()
+    try:
+        data = json.loads(text)
+        records = data if isinstance(data, list) else [data]
+    except ValueError:
+        records = [json.loads(line) for line in text.splitlines() if line.strip()]
+    tours = []
+    for record in records:
+        # batch lines keep the board in "job"
+        board = record.get("job", record)
+        tours.append((record["path"], board.get("width", 8), board.get("height", 8)))
+    return tours
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m frontend.export",
+                                     description="Export tour animations as PNG frames")
+    parser.add_argument("results", help="results file of backend or backend.batch ('-' for stdin)")
+    parser.add_argument("--out", default="frames", help="output directory, default frames")
+    parser.add_argument("--sprite-sheet", action="store_true",
+                        help="one PNG per tour instead of one per frame")
+    parser.add_argument("--cell-size", type=int, default=40, help="pixels per square, default 40")
+    parser.add_argument("--every", type=int, default=1, help="render every Nth step, default 1")
+    parser.add_argument("--columns", type=int, default=8, help="frames per sprite sheet row")
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.out, exist_ok=True)
+    for i, (path, width, height) in enumerate(load_results(args.results), 1):
+        name = os.path.join(args.out, f"tour_{i:04d}")
+        if args.sprite_sheet:
+            print(export_sprite_sheet(path, width, height, name + ".png", args.cell_size,
+                                      args.every, args.columns))
+        else:
+            files = export_frames(path, width, height, name, args.cell_size, args.every)
+            print(f"{name}: {len(files)} frames")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,10 +1,9 @@
 import pygame
 import sys
-from backend.algorithmes import genetic_algorithm
 from enum import Enum
-import threading
 import time
 import os
+from frontend.bridge import SOLVER_DONE, SOLVER_PROGRESS, SolverBridge
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))   # frontend/
 ASSETS_DIR = os.path.join(BASE_DIR, "Assets")
@@ -53,16 +52,25 @@ class Button:
 
 
 class ChessBoard:
-    def __init__(self, x, y, cell_size):
+    def __init__(self, x, y, cell_size, width=8, height=8):
         self.x = x
         self.y = y
         self.cell_size = cell_size
+        self.width = width    # columns
+        self.height = height  # rows
         self.squares = {}
         self.knight_pos = None
         self.current_step = 0
         self.is_animating = False
         self.animation_delay = 0.3
         self.visited_positions = set()
+
+        # Fonts and step number glyphs are made once, not every frame
+        self.font = pygame.font.Font(None, min(24, self.cell_size))
+        self.knight_font = pygame.font.Font(None, 24)
+        self.glyphs = {}          # step number -> rendered text
+        self.steps = {}           # (row, col) -> index in steps_path
+        self.steps_path = None
         
         # Load knight image
         try:
@@ -75,31 +83,69 @@ class ChessBoard:
             self.knight_image = None
 
         # Create square dict: (row, col) -> position mapping
-        for row in range(8):
-            for col in range(8):
+        for row in range(height):
+            for col in range(width):
                 px = x + col * cell_size
                 py = y + row * cell_size
                 self.squares[(row, col)] = (px, py)
 
-    def draw(self, surface, path, current_step):
-        # Draw board with gray and white squares
-        for row in range(8):
-            for col in range(8):
-                px, py = self.squares[(row, col)]
-                color = WHITE if (row + col) % 2 == 0 else GRAY
-                pygame.draw.rect(surface, color, (px, py, self.cell_size, self.cell_size))
+        self.surface = self.render_board()
 
-                # Draw step numbers only for visited positions (up to current_step)
-                if path and (row, col) in path[:current_step + 1]:
-                    step_num = path.index((row, col)) + 1
-                    font = pygame.font.Font(None, 24)
-                    text = font.render(str(step_num), True, BLACK)
-                    text_rect = text.get_rect(center=(px + self.cell_size // 2, py + self.cell_size // 2))
-                    surface.blit(text, text_rect)
-
-                # Draw border
-                pygame.draw.rect(surface, DARK_GRAY, (px, py, self.cell_size, self.cell_size), 2)
+    def render_board(self):
+        # The empty board with gray and white squares, drawn once
+        surface = pygame.Surface((self.width * self.cell_size, self.height * self.cell_size))
+        for row in range(self.height):
+            for col in range(self.width):
+                cell = (col * self.cell_size, row * self.cell_size, self.cell_size, self.cell_size)
+                color = WHITE if (row + col) % 2 == 0 else GRAY
+                pygame.draw.rect(surface, color, cell)
+                pygame.draw.rect(surface, DARK_GRAY, cell, 2)
+        return surface
+
+    def rect(self, position):
+        px, py = self.squares[position]
+        return pygame.Rect(px, py, self.cell_size, self.cell_size)
+
+    def glyph(self, step_num):
+        text = self.glyphs.get(step_num)
+        if text is None:
+            text = self.glyphs[step_num] = self.font.render(str(step_num), True, BLACK)
+        return text
+
+    def step_map(self, path):
+        # (row, col) -> step index, rebuilt only when given another path
+        if path is not self.steps_path:
+            self.steps = {}
+            for step, position in enumerate(path or ()):
+                self.steps.setdefault(position, step)
+            self.steps_path = path
+        return self.steps
 
+    def draw(self, surface, path, current_step):
+        surface.blit(self.surface, (self.x, self.y))
+
+        # Draw step numbers only for visited positions (up to current_step)
+        if path:
+            steps = self.step_map(path)
+            for position in path[:current_step + 1]:
+                text = self.glyph(steps[position] + 1)
+                surface.blit(text, text.get_rect(center=self.rect(position).center))
+
+        self.draw_knight(surface)
+
+    def draw_cell(self, surface, position, path, current_step):
+        # Redraw a single square (for dirty rect updates), returns its rect
+        rect = self.rect(position)
+        surface.blit(self.surface, rect, rect.move(-self.x, -self.y))
+        step = self.step_map(path).get(position)
+        if step is not None and step <= current_step:
+            text = self.glyph(step + 1)
+            surface.blit(text, text.get_rect(center=rect.center))
+        if position == self.knight_pos:
+            self.draw_knight(surface)
+        return rect
+
+    def draw_knight(self, surface):
         # Draw knight using PNG image
         if self.knight_pos:
             px, py = self.squares[self.knight_pos]
@@ -111,8 +157,7 @@ class ChessBoard:
             else:
                 # Fallback to circle if image not available
                 pygame.draw.circle(surface, ACCENT, (px + self.cell_size // 2, py + self.cell_size // 2), 15)
-                font = pygame.font.Font(None, 24)
-                text = font.render("♞", True, WHITE)
+                text = self.knight_font.render("♞", True, WHITE)
                 text_rect = text.get_rect(center=(px + self.cell_size // 2, py + self.cell_size // 2))
                 surface.blit(text, text_rect)
 
@@ -122,13 +167,29 @@ class ChessBoard:
 
 
 class Game:
-    def __init__(self):
+    def __init__(self, solver="genetic", board_width=8, board_height=8):
         pygame.init()
         self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
         pygame.display.set_caption("Knight's Tour - Genetic Algorithm")
         self.clock = pygame.time.Clock()
         self.running = True
 
+        # Loaded and made once; every frame only blits them
+        self.background = self.load_background()
+        self.font_large = pygame.font.Font(None, 48)
+        self.font_title = pygame.font.Font(None, 32)
+        self.font_text = pygame.font.Font(None, 24)
+        self.font_small = pygame.font.Font(None, 16)
+        self.title_text = pygame.font.Font(None, 72).render("", True, DARK_TEXT)
+
+        # What is on screen, so a frame only redraws what changed
+        self.redraw = True          # everything, on the next frame
+        self.menu_hovered = None
+        self.drawn_dots = None
+        self.drawn_progress = None
+        self.drawn_step = None
+        self.drawn_info = None
+
         self.state = GameState.MENU
         self.transition_alpha = 0
         self.transition_speed = 5
@@ -145,7 +206,11 @@ class Game:
         self.load_start_button()
 
         # Game elements
-        self.board = ChessBoard(150, 50, 40)
+        # The board always fits in the same 320x320 area
+        self.board_width = board_width
+        self.board_height = board_height
+        cell_size = max(1, 320 // max(board_width, board_height))
+        self.board = ChessBoard(150, 50, cell_size, board_width, board_height)
         self.path = None
         self.generation = 0
         self.current_step = 0
@@ -158,11 +223,25 @@ class Game:
         self.play_button = Button(250, 400, 60, 60, play_path)
         self.pause_button = Button(320, 400, 60, 60, pause_path)
 
-        # Threading for algorithm
-        self.algorithm_thread = None
-        self.algorithm_running = False
+        # The solver runs in a worker process; its progress and result
+        # arrive as SOLVER_PROGRESS / SOLVER_DONE events (frontend.bridge)
+        self.solver_name = solver  # "genetic", "warnsdorff" or "backtracking"
+        self.bridge = None
+        self.progress = None                   # latest GenerationStats
         self.algorithm_result = None
 
+    def load_background(self):
+        try:
+            bg = pygame.image.load(background_path).convert()
+            return pygame.transform.scale(bg, (WINDOW_WIDTH, WINDOW_HEIGHT))
+        except:
+            return None
+
+    def draw_background(self):
+        self.screen.fill(BLACK)
+        if self.background is not None:
+            self.screen.blit(self.background, (0, 0))
+
     def load_start_button(self):
         """Load start button with hover and pressed states"""
         try:
@@ -190,24 +269,24 @@ class Game:
             self.start_button = Button(225, 423, 250, 60, start1_path)
 
     def run_algorithm(self):
-        """Run genetic algorithm in background"""
-        self.algorithm_running = True
-        try:
-            result = genetic_algorithm(50)
-            if isinstance(result, tuple) and len(result) == 2:
-                self.path, exec_time = result
-                self.execution_time = exec_time  # Store execution time
-                self.generation = 0
-                print(f"Solution found! Execution time: {exec_time:.2f} seconds")
-                self.algorithm_result = (self.path, exec_time)
-            else:
-                print(f"Unexpected result format from genetic_algorithm: {result}")
-                self.algorithm_result = None
-        except Exception as e:
-            print(f"Error running algorithm: {e}")
-            self.algorithm_result = None
-        finally:
-            self.algorithm_running = False
+        """Start the selected solver in the background"""
+        if self.bridge is None:
+            self.bridge = SolverBridge()
+        self.bridge.start(self.solver_name, width=self.board_width, height=self.board_height)
+
+    def on_progress(self, stats):
+        self.progress = stats
+        self.generation = stats.generation
+
+    def on_result(self, result, error):
+        if error is not None:
+            print(f"Error running algorithm: {error}")
+            return
+        if result.stop_reason == "solved":
+            print(f"Solution found! Execution time: {result.execution_time:.2f} seconds")
+        else:
+            print(f"Stopped ({result.stop_reason}), best tour visits {result.fitness} squares")
+        self.algorithm_result = result
 
     def handle_menu_input(self, pos):
         if self.start_button.is_clicked(pos) and not self.algorithm_started:
@@ -215,8 +294,7 @@ class Game:
             self.state = GameState.TRANSITION
             self.transition_counter = 0
             # Start algorithm in background
-            self.algorithm_thread = threading.Thread(target=self.run_algorithm, daemon=True)
-            self.algorithm_thread.start()
+            self.run_algorithm()
 
     def handle_game_input(self, pos):
         if self.play_button.is_clicked(pos):
@@ -224,28 +302,26 @@ class Game:
         if self.pause_button.is_clicked(pos):
             self.is_playing = False
 
+    # The draw_* methods return the screen rects they changed, or None when
+    # they redrew the whole window
+
     def draw_menu(self):
-        # Black background
-        self.screen.fill(BLACK)
-        
-        # Draw background image if available
-        try:
-            bg = pygame.image.load(background_path).convert()
-            bg = pygame.transform.scale(bg, (WINDOW_WIDTH, WINDOW_HEIGHT))
-            self.screen.blit(bg, (0, 0))
-        except:
-            pass
+        # Only redrawn when the start button's hover state changes
+        mouse_pos = pygame.mouse.get_pos()
+        self.start_button.update(mouse_pos)
+        if not self.redraw and self.start_button.hovered == self.menu_hovered:
+            return []
+        self.redraw = False
+        self.menu_hovered = self.start_button.hovered
+
+        # Background image if available, on black
+        self.draw_background()
 
         # Title with dark gray text
-        font_title = pygame.font.Font(None, 72)
-        title = font_title.render("", True, DARK_TEXT)
-        title_rect = title.get_rect(center=(WINDOW_WIDTH // 2, 100))
-        self.screen.blit(title, title_rect)
+        title_rect = self.title_text.get_rect(center=(WINDOW_WIDTH // 2, 100))
+        self.screen.blit(self.title_text, title_rect)
 
         # Draw start button with hover effect
-        mouse_pos = pygame.mouse.get_pos()
-        self.start_button.update(mouse_pos)
-        
         if self.base_button and self.button_rect:
             if self.start_button.hovered:
                 self.screen.blit(self.button_hover, self.button_rect)
@@ -253,18 +329,13 @@ class Game:
                 self.screen.blit(self.base_button, self.button_rect)
         else:
             self.start_button.draw(self.screen)
+        return None
 
     def draw_transition(self):
         # Transition animation
         if self.transition_counter < self.transition_frames:
             # Draw menu background
-            self.screen.fill(BLACK)
-            try:
-                bg = pygame.image.load(background_path).convert()
-                bg = pygame.transform.scale(bg, (WINDOW_WIDTH, WINDOW_HEIGHT))
-                self.screen.blit(bg, (0, 0))
-            except:
-                pass
+            self.draw_background()
             
             # Draw scaling button
             if self.base_button and self.button_rect:
@@ -283,9 +354,10 @@ class Game:
             self.screen.blit(overlay, (0, 0))
             
             self.transition_counter += 1
+            return None
         else:
             # Transition complete - show loading until algorithm finishes
-            if not self.algorithm_running and self.algorithm_result is not None:
+            if self.algorithm_result is not None:
                 # Algorithm finished successfully
                 self.path, exec_time = self.algorithm_result
                 self.execution_time = exec_time
@@ -295,13 +367,26 @@ class Game:
                 # Set initial knight position
                 if self.path:
                     self.board.update_position(self.path, 0)
+                self.redraw = True
+                return []
+            elif self.progress is not None and self.progress.best_path:
+                # Still computing, show the best partial tour so far
+                if self.progress is self.drawn_progress:
+                    return []
+                self.drawn_progress = self.progress
+                self.draw_progress()
+                return None
             else:
-                # Still computing, show loading message
+                # Still computing, show loading message (redrawn when the dots change)
+                dots = "." * ((pygame.time.get_ticks() // 500) % 4)
+                if dots == self.drawn_dots:
+                    return []
+                self.drawn_dots = dots
                 self.screen.fill(BLACK)
                 
                 # Draw loading text with dark gray color
-                font_large = pygame.font.Font(None, 48)
-                font_small = pygame.font.Font(None, 24)
+                font_large = self.font_large
+                font_small = self.font_text
                 
                 loading_text = font_large.render("Working on it...", True, DARK_TEXT)
                 loading_rect = loading_text.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2 - 30))
@@ -312,60 +397,111 @@ class Game:
                 self.screen.blit(info_text, info_rect)
                 
                 # Animated dots
-                dots = "." * ((pygame.time.get_ticks() // 500) % 4)
                 dots_text = font_small.render(dots, True, DARK_TEXT)
                 dots_rect = dots_text.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2 + 50))
                 self.screen.blit(dots_text, dots_rect)
+                return None
+
+    def draw_progress(self):
+        """Live view of the solver: best partial tour and generation stats"""
+        self.screen.fill(BLACK)
+        path = self.progress.best_path
+        self.board.update_position(path, len(path) - 1)
+        self.board.draw(self.screen, path, len(path) - 1)
+
+        info_x = 500
+        font_title = self.font_title
+        font_text = self.font_text
+        squares = self.board_width * self.board_height
+
+        title = font_title.render("Working on it...", True, DARK_TEXT)
+        self.screen.blit(title, (info_x, 50))
+        lines = [
+            f"Generation: {self.progress.generation}",
+            f"Best: {self.progress.best_fitness}/{squares}",
+            f"Mean: {self.progress.mean_fitness:.1f}",
+            f"Time: {self.progress.elapsed:.2f}s",
+        ]
+        for i, line in enumerate(lines):
+            text = font_text.render(line, True, DARK_TEXT)
+            self.screen.blit(text, (info_x, 120 + 40 * i))
+
+    def game_info(self):
+        # What the sidebar shows, compared between frames
+        moves_count = self.current_step + 1 if self.path else 0
+        total_moves = len(self.path) if self.path else 0
+        status = "Complete!" if moves_count == total_moves and total_moves > 0 else "Ready" if not self.is_playing else "In Progress"
+        instructions = not self.is_playing and self.current_step == 0 and bool(self.path)
+        return moves_count, total_moves, status, instructions
 
     def draw_game(self):
+        info = self.game_info()
+        if not (self.redraw or self.drawn_step is None or self.current_step < self.drawn_step):
+            # Only the squares the knight left and reached, and the sidebar
+            rects = []
+            if self.path and self.current_step != self.drawn_step:
+                for position in self.path[self.drawn_step:self.current_step + 1]:
+                    rects.append(self.board.draw_cell(self.screen, position, self.path,
+                                                      self.current_step))
+                self.drawn_step = self.current_step
+            if info != self.drawn_info:
+                rects.append(self.draw_info(info))
+            return rects
+        self.redraw = False
+        self.drawn_step = self.current_step
+
         # Black background
         self.screen.fill(BLACK)
 
         # Draw board with current step to show numbers only for visited positions
         self.board.draw(self.screen, self.path, self.current_step)
 
-        # Draw sidebar info with dark gray text
+        self.draw_info(info)
+
+        # Draw buttons under the board
+        self.play_button.update(pygame.mouse.get_pos())
+        self.pause_button.update(pygame.mouse.get_pos())
+        self.play_button.draw(self.screen)
+        self.pause_button.draw(self.screen)
+
+        # Draw button labels with dark gray text
+        play_label = self.font_small.render("PLAY", True, DARK_TEXT)
+        pause_label = self.font_small.render("PAUSE", True, DARK_TEXT)
+        self.screen.blit(play_label, (self.play_button.rect.x + 15, self.play_button.rect.y + 65))
+        self.screen.blit(pause_label, (self.pause_button.rect.x + 10, self.pause_button.rect.y + 65))
+        return None
+
+    def draw_info(self, info):
+        # Sidebar info with dark gray text, returns the rect it covers
+        moves_count, total_moves, status, instructions = info
         info_x = 500
-        font_title = pygame.font.Font(None, 32)
-        font_text = pygame.font.Font(None, 24)
+        rect = pygame.Rect(info_x, 40, WINDOW_WIDTH - info_x, 250)
+        self.screen.fill(BLACK, rect)
 
         # Title
-        title = font_title.render("INFO", True, DARK_TEXT)
+        title = self.font_title.render("INFO", True, DARK_TEXT)
         self.screen.blit(title, (info_x, 50))
 
         # Moves
-        moves_count = self.current_step + 1 if self.path else 0
-        total_moves = len(self.path) if self.path else 0
-        moves_text = font_text.render(f"Moves: {moves_count}/{total_moves}", True, DARK_TEXT)
+        moves_text = self.font_text.render(f"Moves: {moves_count}/{total_moves}", True, DARK_TEXT)
         self.screen.blit(moves_text, (info_x, 120))
 
         # Status
-        status = "Complete!" if moves_count == total_moves and total_moves > 0 else "Ready" if not self.is_playing else "In Progress"
-        status_text = font_text.render(f"Status: {status}", True, DARK_TEXT)
+        status_text = self.font_text.render(f"Status: {status}", True, DARK_TEXT)
         self.screen.blit(status_text, (info_x, 160))
 
         # Execution Time
         if self.execution_time > 0:
-            time_text = font_text.render(f"Solution Time: {self.execution_time:.2f}s", True, DARK_TEXT)
+            time_text = self.font_text.render(f"Solution Time: {self.execution_time:.2f}s", True, DARK_TEXT)
             self.screen.blit(time_text, (info_x, 200))
 
         # Instructions
-        if not self.is_playing and self.current_step == 0 and self.path:
-            instruction_text = font_text.render("Click PLAY to start", True, DARK_TEXT)
+        if instructions:
+            instruction_text = self.font_text.render("Click PLAY to start", True, DARK_TEXT)
             self.screen.blit(instruction_text, (info_x, 250))
 
-        # Draw buttons under the board
-        self.play_button.update(pygame.mouse.get_pos())
-        self.pause_button.update(pygame.mouse.get_pos())
-        self.play_button.draw(self.screen)
-        self.pause_button.draw(self.screen)
-
-        # Draw button labels with dark gray text
-        font_small = pygame.font.Font(None, 16)
-        play_label = font_small.render("PLAY", True, DARK_TEXT)
-        pause_label = font_small.render("PAUSE", True, DARK_TEXT)
-        self.screen.blit(play_label, (self.play_button.rect.x + 15, self.play_button.rect.y + 65))
-        self.screen.blit(pause_label, (self.pause_button.rect.x + 10, self.pause_button.rect.y + 65))
+        self.drawn_info = info
+        return rect
 
     def update(self):
         if self.state == GameState.MENU:
@@ -385,19 +521,32 @@ class Game:
                 self.board.update_position(self.path, self.current_step)
 
     def draw(self):
+        rects = []
         if self.state == GameState.MENU:
-            self.draw_menu()
+            rects = self.draw_menu()
         elif self.state == GameState.TRANSITION:
-            self.draw_transition()
+            rects = self.draw_transition()
         elif self.state == GameState.GAME:
-            self.draw_game()
+            rects = self.draw_game()
 
-        pygame.display.flip()
+        # Whole window, only the changed rects, or nothing at all
+        if rects is None:
+            pygame.display.flip()
+        elif rects:
+            pygame.display.update(rects)
 
     def handle_events(self):
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 self.running = False
+                if self.bridge is not None:
+                    self.bridge.close()
+            elif event.type == SOLVER_PROGRESS:
+                self.on_progress(event.stats)
+            elif event.type == SOLVER_DONE:
+                self.on_result(event.result, event.error)
+            elif event.type == pygame.WINDOWEXPOSED:
+                self.redraw = True
             elif event.type == pygame.MOUSEBUTTONDOWN:
                 if self.state == GameState.MENU:
                     self.handle_menu_input(event.pos)
@@ -416,5 +565,9 @@ class Game:
 
 
 if __name__ == "__main__":
-    game = Game()
+    # Optional solver name and board size: python -m frontend.main warnsdorff 10 12
+    solver = sys.argv[1] if len(sys.argv) > 1 else "genetic"
+    board_width = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    board_height = int(sys.argv[3]) if len(sys.argv) > 3 else board_width
+    game = Game(solver, board_width, board_height)
     game.main_loop()
\ No newline at end of file